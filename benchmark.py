@@ -0,0 +1,245 @@
+import os
+import json
+import time
+import random
+import sys
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+import db
+import decoder
+import loader
+import pincodes
+import rollups
+import schema
+from extractor import DATASET_PATHS, extract
+from cases import CASES
+from queries import QUERIES, bind
+from states import STATES
+
+
+# Transaction types and device brands used by the real Pulse data
+TRANSACTION_TYPES = ["Recharge & bill payments", "Peer-to-peer payments",
+                     "Merchant payments", "Financial Services", "Others"]
+BRANDS = ["Xiaomi", "Samsung", "Vivo", "Oppo", "OnePlus", "Realme", "Apple",
+          "Motorola", "Huawei", "Others"]
+
+
+# Function to write one synthetic quarter file
+def _write(root, dataset, state, year, quarter, data):
+    folder = os.path.join(root, DATASET_PATHS[dataset], state, str(year))
+    os.makedirs(folder, exist_ok=True)
+    with open(os.path.join(folder, f"{quarter}.json"), "w") as f:
+        json.dump({"success": True, "code": "SUCCESS", "data": data}, f)
+
+
+# Function to split an int total into parts with random weights (the parts add up)
+def _split(rng, total, parts):
+    if not parts:
+        return []
+    weights = [rng.random() + 0.1 for _ in range(parts)]
+    values = [int(total * weight / sum(weights)) for weight in weights]
+    values[-1] += total - sum(values)
+    return values
+
+
+# Function to generate a synthetic Pulse tree with the same layout and JSON shape
+# as the real "data" folder (aggregated|map|top / insurance|transaction|user).
+# The state folders are the real ones, so at most len(STATES) states. As in the
+# real data, the state totals are the sums of the district rows and the top
+# pincodes stay below them, so the tree passes the checks of validate.py.
+def generate(root, states=36, years=7, districts=20, pincodes=10, first_year=2018, seed=0):
+    rng = random.Random(seed)
+    for s, (_, state, _, _) in enumerate(STATES[:states]):
+        district_names = [f"{state} district {d:02d} district" for d in range(districts)]
+        codes = [str(100000 + s * 1000 + p) for p in range(pincodes)]
+        for year in range(first_year, first_year + years):
+            for quarter in range(1, 5):
+                # District rows first: every state total is derived from them
+                hover = [{"name": name, "metric": [{
+                    "type": "TOTAL", "count": rng.randint(1, 10 ** 6),
+                    "amount": rng.random() * 10 ** 9}]} for name in district_names]
+                users = {name: {"registeredUsers": rng.randint(1, 10 ** 6),
+                                "appOpens": rng.randint(1, 10 ** 7)} for name in district_names}
+                count = sum(district["metric"][0]["count"] for district in hover)
+                amount = sum(district["metric"][0]["amount"] for district in hover)
+                registered_users = sum(values["registeredUsers"] for values in users.values())
+                app_opens = sum(values["appOpens"] for values in users.values())
+
+                counts = _split(rng, count, len(TRANSACTION_TYPES))
+                shares = _split(rng, 10 ** 6, len(TRANSACTION_TYPES))
+                transactions = {"transactionData": [
+                    {"name": name, "paymentInstruments": [{
+                        "type": "TOTAL", "count": type_count, "amount": amount * share / 10 ** 6}]}
+                    for name, type_count, share in zip(TRANSACTION_TYPES, counts, shares)]}
+                _write(root, "aggregated_transaction", state, year, quarter, transactions)
+                _write(root, "aggregated_insurance", state, year, quarter, transactions)
+                _write(root, "aggregated_user", state, year, quarter, {
+                    "aggregated": {"registeredUsers": registered_users, "appOpens": app_opens},
+                    "usersByDevice": [{"brand": brand, "count": device_count,
+                                       "percentage": device_count / registered_users}
+                                      for brand, device_count
+                                      in zip(BRANDS, _split(rng, registered_users, len(BRANDS)))],
+                })
+
+                _write(root, "map_transaction", state, year, quarter, {"hoverDataList": hover})
+                _write(root, "map_insurance", state, year, quarter, {"hoverDataList": hover})
+                _write(root, "map_user", state, year, quarter, {"hoverData": users})
+
+                # Top pincodes share at most half of the state total
+                top_counts = _split(rng, count // 2, pincodes)
+                top_shares = _split(rng, 10 ** 6, pincodes)
+                top = [{"entityName": code, "metric": {
+                    "type": "TOTAL", "count": top_count, "amount": amount / 2 * share / 10 ** 6}}
+                       for code, top_count, share in zip(codes, top_counts, top_shares)]
+                _write(root, "top_transaction", state, year, quarter, {"pincodes": top})
+                _write(root, "top_insurance", state, year, quarter, {"pincodes": top})
+                _write(root, "top_user", state, year, quarter, {"pincodes": [
+                    {"name": code, "registeredUsers": top_users} for code, top_users
+                    in zip(codes, _split(rng, registered_users // 2, pincodes))]})
+
+
+# Function to time the extractor of every dataset
+def bench_extract(root, workers=None):
+    results = []
+    for dataset in DATASET_PATHS:
+        start = time.perf_counter()
+        rows = sum(len(batch["State_id"]) for batch in extract(root, dataset, workers))
+        seconds = time.perf_counter() - start
+        results.append({"dataset": dataset, "rows": rows, "seconds": round(seconds, 4),
+                        "rows_per_second": round(rows / seconds) if seconds else 0})
+    return results
+
+
+# Function to time the load of every table and the rollup refresh
+def bench_load(connection, root, workers=None, chunk_size=5000, method="insert"):
+    schema.create_tables(connection)
+    rollups.create_tables(connection)
+    results = []
+    for table in DATASET_PATHS:
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {table}")
+        connection.commit()
+        stats = loader.load_batches(connection, table, extract(root, table, workers),
+                                    chunk_size, method)
+        results.append(stats)
+
+    start = time.perf_counter()
+    rollups.refresh_all(connection)
+    results.append({"table": "rollups", "seconds": round(time.perf_counter() - start, 4)})
+
+    start = time.perf_counter()
+    pincodes.create_table(connection)
+    pincodes.refresh_all(connection)
+    results.append({"table": "pincode_topk", "seconds": round(time.perf_counter() - start, 4)})
+    return results
+
+
+# Parameters used to time the registry queries that take some
+# (first generated state, year and quarter; top 10 districts)
+BENCH_PARAMS = {
+    "map_state_totals": (2018, 1),
+    "district_map_transaction": (1, 2018, 1),
+    "district_map_user": (1, 2018, 1),
+    "district_map_insurance": (1, 2018, 1),
+    "top_districts_by_amount": (10,),
+    "pincode_top_k": ("transaction_amount", 0, 2018, 1),
+}
+
+
+# Function to time every business-case query (median of repeat runs, no cache)
+def bench_queries(connection, repeat=5):
+    results = []
+    for name, query in QUERIES.items():
+        params = bind(name, BENCH_PARAMS.get(name, ()))
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            with connection.cursor() as cursor:
+                cursor.execute(query, params or None)
+                rows = len(cursor.fetchall())
+            timings.append(time.perf_counter() - start)
+        results.append({"query": name, "rows": rows,
+                        "median_ms": round(statistics.median(timings) * 1000, 3),
+                        "min_ms": round(min(timings) * 1000, 3)})
+    return results
+
+
+# Function to time the cold import of the dashboard modules, each in a fresh
+# interpreter: the script's own imports and every business case page
+def bench_imports(modules=("streamlit", "plotly.express", "cases", *CASES.values())):
+    results = []
+    for module in modules:
+        code = ("import time; start = time.perf_counter(); "
+                f"import {module}; print(time.perf_counter() - start)")
+        run = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+        if run.returncode:
+            results.append({"module": module, "error": run.stderr.strip().splitlines()[-1]})
+        else:
+            results.append({"module": module, "import_ms": round(float(run.stdout) * 1000, 3)})
+    return results
+
+
+# Function to open a connection to the benchmark database (created if missing)
+def bench_connection(database):
+    connection = db.get_connection(database=None)
+    with connection.cursor() as cursor:
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS {database}")
+    connection.select_db(database)
+    return connection
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the PhonePe ETL and dashboard queries")
+    parser.add_argument("--root", help="existing pulse 'data' folder (default: generate one)")
+    parser.add_argument("--states", type=int, default=36)
+    parser.add_argument("--years", type=int, default=7)
+    parser.add_argument("--districts", type=int, default=20)
+    parser.add_argument("--pincodes", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--method", choices=list(loader.LOAD_METHODS), default="insert")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database", default="phonepe_bench",
+                        help="MySQL database used for the load and query timings")
+    parser.add_argument("--skip-imports", action="store_true",
+                        help="don't time the dashboard module imports")
+    parser.add_argument("--skip-db", action="store_true", help="only time the extractors")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args()
+
+    root = args.root
+    config = vars(args).copy()
+    config["json_backend"] = decoder.loads.__module__
+    results = {"config": config}
+    if root is None:
+        root = tempfile.mkdtemp(prefix="pulse_bench_")
+        start = time.perf_counter()
+        generate(root, args.states, args.years, args.districts, args.pincodes)
+        results["generate_seconds"] = round(time.perf_counter() - start, 4)
+
+    if not args.skip_imports:
+        results["imports"] = bench_imports()
+    try:
+        results["extract"] = bench_extract(root, args.workers)
+        if not args.skip_db:
+            connection = bench_connection(args.database)
+            try:
+                results["load"] = bench_load(connection, root, args.workers,
+                                             args.chunk_size, args.method)
+                results["queries"] = bench_queries(connection, args.repeat)
+            finally:
+                connection.close()
+    finally:
+        if args.root is None:
+            shutil.rmtree(root)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
@@ -0,0 +1,141 @@
+# Typed column buffers filled by the extractor. Every numeric column is an
+# array.array of its final type (one machine value per row, no Python object per
+# row) and every dimension column (districts, pincodes, ...) is an array of codes
+# into the distinct values seen so far, so a name is stored once per buffer.
+# The buffers are handed to pandas and Arrow without copying the numbers, and
+# pickle as raw bytes between the worker processes and the parent.
+from array import array
+
+
+# array.array type code of every pandas dtype used in extractor.DTYPES
+# (a "category" column is stored as int32 codes)
+TYPECODES = {
+    "int8": "b",
+    "int16": "h",
+    "int32": "i",
+    "int64": "q",
+    "float64": "d",
+    "category": "i",
+}
+
+
+# Codes of the distinct values of a dimension column, in order of appearance.
+# A missing value (None) gets code -1 and isn't one of the values.
+class _Interner(dict):
+    def __missing__(self, value):
+        if value is None:
+            return -1
+        code = self[value] = len(self)
+        return code
+
+
+# Accumulator of the rows of one table, column by column
+class ColumnBuffer:
+    def __init__(self, columns, dtypes):
+        self.columns = list(columns)
+        self.dtypes = {column: dtypes[column] for column in self.columns}
+        self.buffers = {column: array(TYPECODES[self.dtypes[column]]) for column in self.columns}
+        self.codes = {column: _Interner() for column in self.columns
+                      if self.dtypes[column] == "category"}
+        # (source, rows) of every extend() given a source, e.g. the file the rows
+        # came from, and (source, message) of the sources that couldn't be read
+        self.sources = []
+        self.errors = []
+
+    def __len__(self):
+        return len(self.buffers[self.columns[0]])
+
+    # Function to add rows: constants gives the value of the leading columns for
+    # every row (e.g. State_id, Years, Quarter of a file), rows the other columns.
+    # The new values are converted first, so a value that doesn't fit its column
+    # (None, a string in a number column, ...) raises without adding anything.
+    def extend(self, constants, rows, source=None):
+        count = len(rows)
+        buffers = [self.buffers[column] for column in self.columns]
+        interners = [self.codes.get(column) for column in self.columns]
+        new = []
+        for buffer, interner, value in zip(buffers, interners, constants):
+            if interner is not None:
+                value = interner[value]
+            # Repeating a one-item array fills the new rows in one allocation
+            new.append(array(buffer.typecode, (value,)) * count)
+        start = len(constants)
+        for buffer, interner, values in zip(buffers[start:], interners[start:], zip(*rows)):
+            if interner is not None:
+                values = map(interner.__getitem__, values)
+            new.append(array(buffer.typecode, list(values)))
+        for buffer, values in zip(buffers, new):
+            buffer.extend(values)
+        if source is not None:
+            self.sources.append((source, count))
+
+    # Function to get a new buffer with the rows where mask (a NumPy bool array) is
+    # True. Sources that lose all their rows are dropped, the others keep their
+    # order with their remaining row counts.
+    def take(self, mask):
+        import numpy as np
+
+        taken = ColumnBuffer(self.columns, self.dtypes)
+        for column in self.columns:
+            taken.buffers[column].frombytes(self.numpy(column)[mask].tobytes())
+        for column, interner in self.codes.items():
+            taken.codes[column].update(interner)
+        counts = [rows for _, rows in self.sources]
+        source_index = np.repeat(np.arange(len(counts)), counts)
+        kept = np.bincount(source_index[mask], minlength=len(counts))
+        taken.sources = [(source, int(rows)) for (source, count), rows in zip(self.sources, kept)
+                         if rows or not count]
+        taken.errors = list(self.errors)
+        return taken
+
+    # Function to get the distinct values of a dimension column (indexed by code;
+    # code -1 is a missing value)
+    def categories(self, column):
+        return list(self.codes[column])
+
+    # Function to get the values of a column as a sequence of Python values
+    # (dimension values are looked up from their codes)
+    def __getitem__(self, column):
+        if column in self.codes:
+            categories = self.categories(column) + [None]
+            return [categories[code] for code in self.buffers[column]]
+        return self.buffers[column]
+
+    # Function to get a column as a NumPy array sharing the buffer's memory
+    def numpy(self, column):
+        import numpy as np
+
+        buffer = self.buffers[column]
+        return np.frombuffer(buffer, dtype=buffer.typecode)
+
+    # Function to build a DataFrame: numeric columns are views of the buffers and
+    # dimension columns categoricals over the codes
+    def to_frame(self):
+        import pandas as pd
+
+        data = {}
+        for column in self.columns:
+            if column in self.codes:
+                data[column] = pd.Categorical.from_codes(self.numpy(column), self.categories(column))
+            else:
+                data[column] = self.numpy(column)
+        return pd.DataFrame(data, columns=self.columns, copy=False)
+
+    # Function to build an Arrow table: numeric columns are views of the buffers and
+    # dimension columns dictionary arrays over the codes
+    def to_arrow(self):
+        import pyarrow as pa
+
+        arrays = []
+        for column in self.columns:
+            values = self.numpy(column)
+            if column in self.codes:
+                # Code -1 (a missing value) becomes a null of the dictionary array
+                missing = values < 0
+                values = pa.DictionaryArray.from_arrays(
+                    pa.array(values, mask=missing if missing.any() else None),
+                    pa.array(self.categories(column)))
+            else:
+                values = pa.array(values)
+            arrays.append(values)
+        return pa.Table.from_arrays(arrays, names=self.columns)
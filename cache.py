@@ -0,0 +1,85 @@
+import re
+import time
+import threading
+from collections import OrderedDict
+
+
+# Function to normalize SQL text so that the same query always gets the same key
+# (whitespace and a trailing semicolon don't matter)
+def normalize_sql(sql):
+    return re.sub(r"\s+", " ", sql).strip().rstrip(";").strip()
+
+
+# In-memory cache of query results with a TTL and LRU eviction.
+# The cache is emptied as soon as the data version written by the ingest changes;
+# the version is checked at most once every version_check_seconds. Every entry
+# keeps the version it was read under, so a query that started before a version
+# change and finished after it is never served as fresh.
+class QueryCache:
+    def __init__(self, ttl=600, max_size=256, version_check_seconds=5):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.version_check_seconds = version_check_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self._version_checked_at = 0.0
+
+    # Function to build the cache key of a query
+    def key(self, sql, params=None):
+        return normalize_sql(sql), tuple(params) if params is not None else None
+
+    # Function to empty the cache when the data version has changed
+    def _check_version(self, data_version):
+        now = time.monotonic()
+        if now - self._version_checked_at < self.version_check_seconds:
+            return
+        version = data_version()
+        with self._lock:
+            self._version_checked_at = now
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+
+    # Function to get the data version (read at most once every version_check_seconds)
+    def current_version(self, data_version):
+        self._check_version(data_version)
+        return self._version
+
+    # Function to get a cached result or run the query and cache its result.
+    # run(sql, params) returns a DataFrame; data_version() returns the current version.
+    # A copy is returned so callers can add columns without changing the cached frame.
+    def get_or_run(self, sql, params, run, data_version=None):
+        if data_version is not None:
+            self._check_version(data_version)
+        key = self.key(sql, params)
+        now = time.monotonic()
+        with self._lock:
+            version = self._version
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < self.ttl and entry[1] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2].copy()
+        self.misses += 1
+        result = run(sql, params)
+        with self._lock:
+            # Not cached if the version changed while the query ran
+            if version == self._version:
+                self._entries[key] = (now, version, result)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return result.copy()
+
+    # Function to drop every cached result
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Cache shared by every dashboard session (modules are imported once per process,
+# while phonepe.py itself runs again on every Streamlit rerun)
+QUERY_CACHE = QueryCache()
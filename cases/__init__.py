@@ -0,0 +1,31 @@
+# Business case pages of the dashboard. Each case is a module with a render()
+# function, imported the first time the case is selected: the home page and the
+# other cases don't pay for its imports (plotly, pandas, geo, ...) or its code.
+import sys
+import time
+import importlib
+
+import metrics
+
+
+# Modules of the business cases, by menu label (in menu order)
+CASES = {
+    "1. Decoding Transaction Dynamics on PhonePe": "cases.transaction_dynamics",
+    "2. Device Dominance and User Engagement Analysis": "cases.device_engagement",
+    "3. Transaction Analysis for Market Expansion": "cases.market_expansion",
+    "4. User Engagement and Growth Strategy": "cases.user_growth",
+    "5. Insurance Engagement Analysis": "cases.insurance",
+    "6. Pincode Analytics": "cases.pincode_analytics",
+}
+
+
+# Function to get the module of a business case, importing it on first use
+# (the import time is recorded in metrics; later runs reuse sys.modules)
+def load(label):
+    name = CASES[label]
+    module = sys.modules.get(name)
+    if module is None:
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        metrics.record_import(name, time.perf_counter() - start)
+    return module
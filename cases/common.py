@@ -0,0 +1,78 @@
+# Helpers shared by the business case modules: the storage backend and the
+# cached, timed query, figure and growth results
+import time
+
+import pandas as pd
+import streamlit as st
+
+import metrics
+import storage
+from cache import QUERY_CACHE
+from charts import FIGURE_CACHE
+from queries import QUERIES, bind
+from session_store import ResultStore
+
+
+# Storage backend answering the queries (MySQL, or Parquet files with PHONEPE_BACKEND=parquet)
+backend = storage.get_backend()
+
+# Function to execute a registry query and return DataFrame
+def execute_named(name, params, timings=None):
+    start = time.perf_counter()
+    columns, rows = backend.read_named(name, params)
+    fetched = time.perf_counter()
+    df = pd.DataFrame(rows, columns=columns)
+    if timings is not None:
+        timings["db"] = fetched - start
+        timings["frame"] = time.perf_counter() - fetched
+    return df
+
+# Function to run a registry query (see queries.py) with bound parameters through
+# the shared cache (same name and parameters are served from memory until the TTL
+# expires or new data is loaded). The cache key is the query name and parameter
+# values. Every call is recorded in metrics, cache hits included.
+def run_named(name, *params):
+    params = bind(name, params)
+    start = time.perf_counter()
+    timings = {}
+    df = QUERY_CACHE.get_or_run(
+        name, params, lambda _, args: execute_named(name, args, timings), backend.data_version)
+    metrics.record_query(QUERIES[name], len(df), timings.get("db", 0.0), timings.get("frame", 0.0),
+                         time.perf_counter() - start, cached=not timings, name=name)
+    return df
+
+# Function to get a registry query result indexed by the given columns, kept in
+# the session so selector changes don't run the query again (see session_store.py)
+def indexed_result(name, by, prepare=None):
+    version = QUERY_CACHE.current_version(backend.data_version)
+    return ResultStore(st.session_state).get(name, by, lambda: run_named(name), version, prepare)
+
+# Function to build a figure, recording its build time in metrics under spec
+# (e.g. the query name and chart variant)
+def timed_figure(spec, build):
+    start = time.perf_counter()
+    figure = build()
+    metrics.record_figure(spec, time.perf_counter() - start)
+    return figure
+
+# Function to get a figure from the shared figure cache, keyed by the data version
+# and the chart spec; build() only runs (timed) when the figure isn't cached
+def cached_figure(spec, build):
+    version = QUERY_CACHE.current_version(backend.data_version)
+    cached = True
+
+    def build_timed():
+        nonlocal cached
+        cached = False
+        return timed_figure(spec, build)
+
+    figure = FIGURE_CACHE.get_or_build(version, spec, build_timed)
+    if cached:
+        metrics.record_figure(spec, 0.0, cached=True)
+    return figure
+
+# Function to run a growth computation (see growth.py) over a registry query result,
+# cached like the query itself until the data version changes
+def growth_result(name, kind, build):
+    return QUERY_CACHE.get_or_run(f"growth {name} {kind}", None,
+                                  lambda *_: build(run_named(name)), backend.data_version)
@@ -0,0 +1,138 @@
+# Business case 2: device dominance and user engagement
+import plotly.express as px
+import streamlit as st
+
+from cases.common import cached_figure, run_named, timed_figure
+
+
+# Function to render the case and return the selected sub-question
+def render():
+    st.subheader(" Business Case 2: Device Dominance and User Engagement Analysis")
+
+    sub_question = st.selectbox(
+    "Select a Sub-Question",
+    [
+        "1. Top 10 Districts with Most Users",
+        "2. Registered Users vs App Opens Trend",
+        "3. Yearly Growth of Registered Users",
+        "4. Device Type Usage Distribution",
+        "5. User Engagement Rate by State",
+        "6. Device Preference by State"
+
+    ]
+    )
+    # Sub-Question 1
+    if sub_question == "1. Top 10 Districts with Most Users":
+        df = run_named("top10_districts_by_users")
+
+        st.markdown("### Top 10 Districts by Registered Users")
+
+        fig = timed_figure(("top10_districts_by_users", "bar"), lambda: px.bar(
+            df,
+            x="Districts",
+            y="total_users",
+            text="total_users",
+            title="Top 10 Districts with Most Registered Users",
+            labels={"Districts": "District", "total_users": "Registered Users"},
+            color="Districts",
+            height=600,
+            width=800
+        ))
+
+        fig.update_traces(textposition='outside')
+        st.plotly_chart(fig, use_container_width=True)
+
+    # Sub-Question 2
+    if sub_question == "2. Registered Users vs App Opens Trend":
+
+
+        # Run the query and store the result in a DataFrame
+        result_df = run_named("users_vs_app_opens_by_year")
+
+        # Ensure the result is not empty
+        if result_df.empty:
+            st.error("No data found.")
+        else:
+            # Plotting the trend of registered users and app opens over time
+            fig = timed_figure(("users_vs_app_opens_by_year", "line"), lambda: px.line(result_df, 
+                        x='Years', 
+                        y=['total_registered_users', 'total_app_opens'],
+                        title='Registered Users vs App Opens Trend',
+                        labels={'Years': 'Year', 'total_registered_users': 'Registered Users', 
+                         'total_app_opens': 'App Opens', 'variable': 'Metric'}
+                        ))
+
+            st.plotly_chart(fig, use_container_width=True)
+
+
+    # Sub-Question 3
+    elif sub_question == "3. Yearly Growth of Registered Users":
+        df = run_named("registered_users_by_year")
+        st.markdown("### Yearly Growth of Registered Users")
+        fig = timed_figure(("registered_users_by_year", "line"), lambda: px.line(df,
+                    x="Years",
+                    y="total_users",
+                    markers=True,
+                    title="Yearly Growth of Registered Users",
+                    labels={"Years": "Year", "total_users": "Registered Users"},
+                    height=500,
+                    width=900 
+                ))
+
+        fig.update_traces(line=dict(width=3), marker=dict(size=8))
+
+        st.plotly_chart(fig, use_container_width=True)
+
+
+    # Sub-Question 4
+    elif sub_question == "4. Device Type Usage Distribution":
+        df = run_named("device_brand_share")
+        st.markdown("### Device Type Usage Distribution")
+        fig = timed_figure(("device_brand_share", "pie"), lambda: px.pie(df, names="Brands", values="total_users", title="Device Brand Usage Share"))
+        st.plotly_chart(fig)
+
+    # Sub-Question 5
+    elif sub_question == "5. User Engagement Rate by State":
+
+        # Run the query and store the result in a DataFrame
+        result_df = run_named("engagement_rate_by_state")
+
+        fig = timed_figure(("engagement_rate_by_state", "bar"), lambda: px.bar(result_df, 
+                    x='States', 
+                    y='engagement_rate',
+                    title='User Engagement Rate by State',
+                    color= 'States',
+                    labels={'States': 'State', 'engagement_rate': 'Engagement Rate'},
+                    height=600,
+                    width=800
+                    ))
+
+        st.plotly_chart(fig, use_container_width=True)
+
+    # Sub-Question 6
+    elif sub_question == "6. Device Preference by State":
+
+        # SQL query to get device preference by region/state
+
+        # Run the query and store the result in a DataFrame
+        result_df = run_named("device_preference_by_state")
+
+        # Ensure the result is not empty
+        if result_df.empty:
+            st.error("No data found.")
+        else:
+            # Plotting the device preference by state using a stacked bar chart
+            fig = cached_figure(("device_preference_by_state", "stacked"), lambda: px.bar(result_df, 
+                        x='States', 
+                        y='num_users',
+                        color='Brands', 
+                        title='Device Preference by Region/State',
+                        labels={'States': 'State', 'num_users': 'Number of Registered Users'},
+                        barmode='stack',
+                        height=700,
+                        width=900
+                        ))
+
+            st.plotly_chart(fig, use_container_width=True)
+
+    return sub_question
@@ -0,0 +1,99 @@
+# Business case 5: insurance engagement analysis
+import plotly.express as px
+import streamlit as st
+
+from cases.common import run_named, timed_figure
+from charts import matplotlib_figure
+
+
+# Function to render the case and return the selected sub-question
+def render():
+    st.subheader(" Business Case 5: Insurance Engagement Analysis")
+
+    sub_question = st.selectbox(
+    "Select a Sub-Question",
+    [
+        "1. Total Insurance Transaction Value by State",
+        "2. Insurance Growth Over Time by Year and Quarter",
+        "3. Top 10 States with Highest Insurance Transactions",
+        "4. Insurance Transactions at District Level",
+
+    ]
+    )
+    # Sub-Question 1
+    if sub_question == "1. Total Insurance Transaction Value by State":
+        # Run your query and get the result as a DataFrame
+        df = run_named("insurance_value_by_state")
+
+        st.markdown("### Total Insurance Transaction Value by State")
+
+        # Plotting with Matplotlib
+        def build_bar():
+            fig, ax = matplotlib_figure(figsize=(10, 6))  
+            ax.bar(df['States'], df['Total_Insurance_Value'], color='skyblue')
+
+            # Add labels and title
+            ax.set_xlabel('States', fontsize=12)
+            ax.set_ylabel('Total Insurance Transaction Value', fontsize=12)
+            ax.set_title('Total Insurance Transaction Value by State', fontsize=14)
+
+            # Rotate x-axis labels for better readability 
+            ax.tick_params(axis='x', labelrotation=45)
+            for label in ax.get_xticklabels():
+                label.set_horizontalalignment('right')
+            return fig
+
+
+        st.pyplot(timed_figure(("insurance_value_by_state", "bar"), build_bar))
+
+    # Sub-Question 2
+    elif sub_question == "2. Insurance Growth Over Time by Year and Quarter":
+        df = run_named("insurance_value_by_quarter")
+        df["Year_Quarter"] = df["Years"].astype(str) + " Q" + df["Quarter"].astype(str)
+        st.markdown("### Insurance Growth Over Time")
+        st.line_chart(df.set_index("Year_Quarter"))
+
+    # Sub-Question 3: Top 10 States with Highest Insurance Transactions
+    elif sub_question == "3. Top 10 States with Highest Insurance Transactions":
+        df = run_named("top10_states_by_insurance_count")
+
+        # Display title
+        st.markdown("### Top 10 States with Highest Insurance Transactions")
+
+        # the bar chart using Matplotlib
+        def build_bar():
+            fig, ax = matplotlib_figure(figsize=(10, 6))  
+            ax.bar(df['States'], df['Total_Insurance_Count'], color='orange')
+
+            # Adding labels and title
+            ax.set_xlabel('States', fontsize=12)
+            ax.set_ylabel('Total Insurance Transactions', fontsize=12)
+            ax.set_title('Top 10 States with Highest Insurance Transactions', fontsize=14)
+
+            # Rotate x-axis labels for better readability
+            ax.tick_params(axis='x', labelrotation=45)
+            for label in ax.get_xticklabels():
+                label.set_horizontalalignment('right')
+            return fig
+
+        # Display the plot in Streamlit
+        st.pyplot(timed_figure(("top10_states_by_insurance_count", "bar"), build_bar))
+
+    # Sub-Question 4
+    elif sub_question == "4. Insurance Transactions at District Level":
+        df = run_named("top10_districts_by_insurance")
+        # Display the title for the chart
+        st.markdown("### Top 10 Districts by Insurance Transactions")
+
+        # Create a bar chart using Plotly
+        fig = timed_figure(("top10_districts_by_insurance", "bar"), lambda: px.bar(df, x='Districts', y='Insurance_Count', 
+                    title="Top 10 Districts by Insurance Transactions", 
+                    labels={'Districts': 'District', 'Insurance_Count': 'Insurance Transactions'},
+                    color='Insurance_Count', 
+                    color_continuous_scale='Blues')) 
+
+
+        # Show the plot in Streamlit
+        st.plotly_chart(fig)
+
+    return sub_question
@@ -0,0 +1,185 @@
+# Business case 3: transaction analysis for market expansion
+import plotly.express as px
+import streamlit as st
+
+import growth
+from cases.common import cached_figure, growth_result, run_named, timed_figure
+from charts import render_mode
+from queries import TOP_DISTRICT_CHOICES
+
+
+# Function to render the case and return the selected sub-question
+def render():
+    st.subheader(" Business Case 3: Transaction Analysis for Market Expansion")
+
+    sub_question = st.selectbox(
+    "Select a Sub-Question",
+    [
+        "1. Top 10 States by Total Transaction Amount",
+        "2. State-wise Transaction Growth Over Time",
+        "3. Transaction Type Usage by State",
+        "4. Top Districts by Transaction Volume",
+        "5. Top Transaction Types by Amount",
+        "6. Fastest Growing Districts"
+    ]
+    )
+
+    # Sub-Question 1
+    #Which states show the highest total transaction amount?
+
+    if sub_question == "1. Top 10 States by Total Transaction Amount":
+        df = run_named("top10_states_by_amount")
+        st.markdown("### Top 10 States by Total Transaction Amount")
+        fig = timed_figure(("top10_states_by_amount", "bar"), lambda: px.bar(
+                    df,
+                    x="States",
+                    y="Total_Amount",
+                    text="Total_Amount",
+                    color="States",
+                    title="Top 10 States by Total Transaction Amount",
+                    labels={"States": "State", "Total_Amount": "Transaction Amount"},
+                    height=600,
+                    width=800,
+                    color_discrete_sequence=px.colors.qualitative.Safe  # Beginner-friendly named palette
+                    ))
+        fig.update_traces(textposition='outside')
+        fig.update_layout(xaxis_tickangle=-45)
+
+        st.plotly_chart(fig, use_container_width=True)
+
+    # Sub-Question 2
+    #Which states have shown the most growth over time?
+
+    elif sub_question == "2. State-wise Transaction Growth Over Time":
+        df = run_named("transaction_amount_by_year_state")
+        st.markdown("### State-wise Transaction Growth Over Time")
+        # One line per state: WebGL once the point count gets large
+        def build_growth():
+            fig = px.line(
+                        df,
+                        x="Years",
+                        y="Total_Amount",
+                        color="States",
+                        markers=True,
+                        title="Yearly Transaction Growth by State",
+                        labels={"Years": "Year", "Total_Amount": "Transaction Amount", "States": "State"},
+                        color_discrete_sequence=px.colors.qualitative.Set2,
+                        render_mode=render_mode(df)
+                        )
+            fig.update_layout(height=700, width=900)
+            return fig
+
+        fig = cached_figure(("transaction_amount_by_year_state", "line"), build_growth)
+        st.plotly_chart(fig, use_container_width=True)
+
+        # Fastest-growing states: CAGR between the first and last quarter
+        summary = growth_result("transaction_amount_by_state_quarter", "summary",
+                                lambda df: growth.summarize(growth.add_growth(df, ["States"], "Total_Amount"),
+                                                            ["States"], "Total_Amount"))
+        st.markdown("### Fastest Growing States")
+        ranked = growth.fastest_growing(summary, by="CAGR", top=10)
+        cagr_fig = timed_figure(("transaction_amount_by_state_quarter", "cagr"), lambda: px.bar(
+            ranked, x="States", y="CAGR", text="Rank",
+            hover_data={"Latest_YoY": ":.1%"},
+            title="Top 10 States by Compound Annual Growth Rate",
+            labels={"States": "State", "CAGR": "CAGR", "Latest_YoY": "Latest YoY"}))
+        cagr_fig.update_yaxes(tickformat=".0%")
+        st.plotly_chart(cagr_fig, use_container_width=True)
+
+    # Sub-Question 3
+    #Which transaction types are most used in growing states?
+
+    elif sub_question == "3. Transaction Type Usage by State":
+        df = run_named("transaction_type_by_state")
+
+         # Stacked Bar Chart
+        st.markdown("#### Transaction Amount by Type and State")
+        fig_stacked = cached_figure(("transaction_type_by_state", "stacked"), lambda: px.bar(
+            df,
+            x="States",
+            y="Total_Amount",
+            color="Transaction_type",
+            barmode="stack",
+            title="Transaction Amount by Type and State",
+            labels={"States": "State", "Total_Amount": "Transaction Amount", "Transaction_type": "Type"},
+            height=800
+        ))
+        st.plotly_chart(fig_stacked, use_container_width=True)
+
+    # Sub-Question 4
+    #What is the transaction volume at the district level?
+
+    elif sub_question == "4. Top Districts by Transaction Volume":
+        st.markdown("### Top Districts by Transaction Volume")
+
+        # Dropdown to select top N
+        top_n = st.selectbox("Select number of top districts", TOP_DISTRICT_CHOICES, index=1)
+
+        df = run_named("top_districts_by_amount", top_n)
+
+        fig = timed_figure(("top_districts_by_amount", "bar"), lambda: px.bar(
+            df,
+            x="Districts",
+            y="Total_Amount",
+            text="Total_Amount",
+            title=f"Top {top_n} Districts by Transaction Volume",
+            labels={"Districts": "District", "Total_Amount": "Transaction Volume"},
+            color_discrete_sequence=px.colors.qualitative.Plotly,
+            height=600
+        ))
+        fig.update_traces(textposition='outside')
+        fig.update_layout(xaxis_tickangle=-45)
+
+        st.plotly_chart(fig, use_container_width=True)
+
+
+    # Sub-Question 5
+    elif sub_question == "5. Top Transaction Types by Amount":
+        df = run_named("transaction_types_by_amount")
+
+        st.markdown("### Top Transaction Types by Total Transaction Amount")
+
+        fig = timed_figure(("transaction_types_by_amount", "bar"), lambda: px.bar(
+            df,
+            x="Total_Amount",
+            y="Transaction_type",
+            orientation='h',
+            text="Total_Amount",
+            color_discrete_sequence=["indianred"],
+            labels={"Transaction_type": "Transaction Type", "Total_Amount": "Transaction Amount"},
+            title="Top Transaction Types by Amount"
+        ))
+
+        fig.update_traces(textposition="outside")
+        fig.update_layout(height=500)
+
+        st.plotly_chart(fig, use_container_width=True)
+
+    # Sub-Question 6
+    #Which districts are growing the fastest?
+
+    elif sub_question == "6. Fastest Growing Districts":
+        st.markdown("### Fastest Growing Districts")
+
+        by = st.radio("Rank by", ["CAGR", "Latest_YoY"], horizontal=True,
+                      format_func={"CAGR": "CAGR (whole period)", "Latest_YoY": "Latest year-over-year"}.get)
+
+        # Growth of every district in one vectorized pass, cached per data version
+        summary = growth_result("district_amount_by_quarter", "summary",
+                                lambda df: growth.summarize(
+                                    growth.add_growth(df, ["States", "Districts"], "Total_Amount"),
+                                    ["States", "Districts"], "Total_Amount"))
+        ranked = growth.fastest_growing(summary, by=by, top=15)
+
+        fig = timed_figure(("district_amount_by_quarter", "growth"), lambda: px.bar(
+            ranked, x=by, y="Districts", orientation="h", color="States",
+            hover_data={"Latest_YoY": ":.1%", "CAGR": ":.1%"},
+            title="Top 15 Districts by Transaction Amount Growth",
+            labels={"Districts": "District", "States": "State",
+                    "CAGR": "CAGR", "Latest_YoY": "Latest YoY"}))
+        fig.update_xaxes(tickformat=".0%")
+        fig.update_yaxes(categoryorder="total ascending")
+        st.plotly_chart(fig, use_container_width=True)
+        st.dataframe(ranked)
+
+    return sub_question
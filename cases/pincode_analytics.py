@@ -0,0 +1,71 @@
+# Business case 6: top pincodes per state and quarter (see pincodes.py)
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+import pincodes
+import states
+from cases.common import run_named, timed_figure
+
+
+# Labels of the pincode ranking metrics (see pincodes.py)
+PINCODE_METRICS = {
+    "transaction_amount": "Transaction Amount",
+    "transaction_count": "Transaction Count",
+    "insurance_amount": "Insurance Amount",
+    "insurance_count": "Insurance Count",
+    "registered_users": "Registered Users",
+}
+
+# Function to render the case and return the selected sub-question
+def render():
+    st.subheader(" Business Case 6: Pincode Analytics")
+
+    sub_question = st.selectbox(
+    "Select a Sub-Question",
+    [
+        "1. Top Pincodes by State, Year and Quarter",
+    ]
+    )
+
+    # Sub-Question 1: top-K pincodes of a window with their quarter-over-quarter rank change
+    if sub_question == "1. Top Pincodes by State, Year and Quarter":
+        windows = run_named("pincode_windows")
+
+        st.markdown("### Top Pincodes by State, Year and Quarter")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            metric = st.selectbox("Rank by", list(PINCODE_METRICS), format_func=PINCODE_METRICS.get)
+        with col2:
+            state = st.selectbox("State", ["All India"] + [name for _, _, name, _ in states.STATES])
+        with col3:
+            top_k = st.slider("Top K", 1, pincodes.TOP_K, pincodes.TOP_K)
+
+        state_id = pincodes.ALL_INDIA if state == "All India" else states.ID_BY_NAME[state]
+        periods = windows[windows["State_id"] == state_id]
+        if periods.empty:
+            st.error("No data found.")
+        else:
+            col1, col2 = st.columns(2)
+            with col1:
+                y = st.select_slider("Years", list(periods["Years"].unique()), key="pincode_years")
+            with col2:
+                q = st.select_slider("Quarter", list(periods["Quarter"].unique()), key="pincode_quarter")
+
+            df = run_named("pincode_top_k", metric, state_id, int(y), int(q)).head(top_k)
+
+            # Positive change = the pincode moved up since the previous quarter
+            df["Pincodes"] = df["Pincodes"].astype(str)
+            df["Rank_change"] = pd.to_numeric(df["Prev_rank"]) - df["Rnk"]
+            df["Movement"] = df["Rank_change"].map(
+                lambda change: "new" if pd.isna(change) else f"{int(change):+d}")
+
+            fig = timed_figure(("pincode_top_k", "bar"), lambda: px.bar(df, x="Pincodes", y="Value", text="Movement",
+                         title=f"Top {top_k} Pincodes by {PINCODE_METRICS[metric]} - {state}, Q{q} {y}",
+                         labels={"Pincodes": "Pincode", "Value": PINCODE_METRICS[metric]},
+                         color="Value", color_continuous_scale="Blues"))
+            fig.update_xaxes(type="category")
+            st.plotly_chart(fig, use_container_width=True)
+            st.dataframe(df[["Rnk", "Pincodes", "Value", "Prev_rank", "Movement"]])
+
+    return sub_question
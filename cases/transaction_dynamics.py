@@ -0,0 +1,329 @@
+# Business case 1: transaction dynamics by state, type and period, with the state and
+# district maps
+import plotly.express as px
+import streamlit as st
+
+import geo
+import growth
+import states
+from cases.common import cached_figure, indexed_result, run_named, timed_figure
+from charts import matplotlib_figure
+from executor import gather
+
+
+# Function to get map data for a given year and quarter
+# (Geo_name is the state name used by the boundaries file)
+def map_data(years, quarter):
+    return run_named("map_state_totals", years, quarter)
+
+# Registry query of every district map mode
+DISTRICT_MAP_MODES = {
+    "Transactions": "district_map_transaction",
+    "Users": "district_map_user",
+    "Insurance": "district_map_insurance",
+}
+
+# Function to get the district values of one state for a year and quarter
+# (the filter matches the primary key prefix State_id, Years, Quarter)
+def district_map_data(mode, state, years, quarter):
+    df = run_named(DISTRICT_MAP_MODES[mode], states.ID_BY_NAME[state], years, quarter)
+    df["district_key"] = df["district"].map(geo.name_key)
+    return df
+
+# Function to render the case and return the selected sub-question
+def render():
+    st.subheader(" Business Case 1: Decoding Transaction Dynamics")
+
+    sub_question = st.selectbox(
+        "Select a Sub-Question",
+        [
+            "1. Overall transaction volume by states and type",
+            "2. Transaction trends across states over time",
+            "3. Top growing payment categories by states and year",
+            "4. Top 10 State-wise Total Transaction Amount",
+            "5. Total Transaction Amount Analysis",
+            "6. District-level Map by State"
+        ]
+    )
+
+
+
+    # Sub-Question 1
+    if sub_question == "1. Overall transaction volume by states and type":
+        result_df = run_named("transaction_volume_by_state")
+
+
+        st.markdown("### Transaction Volume and Value by State")
+
+        # Total Transaction Amount bar chart
+        fig_amount = cached_figure(("transaction_volume_by_state", "amount"), lambda: px.bar(
+                result_df,
+                x="States",
+                y="Total_Amount",
+                text="Total_Amount",
+                title="Total Transaction Amount by State",
+                labels={"States": "State", "Total_Amount": "Transaction Amount"},
+                color="Total_Amount",
+                color_continuous_scale="Blues",
+                height=700, 
+                width=900   
+            ))
+
+        st.plotly_chart(fig_amount, use_container_width=True)
+
+        # Total Transaction Count bar chart
+        fig_count = cached_figure(("transaction_volume_by_state", "count"), lambda: px.bar(
+                result_df,
+                x="States",
+                y="Total_Count",
+                text="Total_Count",
+                title="Total Transaction Count by State",
+                labels={"States": "State", "Total_Count": "Transaction Count"},
+                color="Total_Count",
+                color_continuous_scale="Greens",
+                height=700, 
+                width=900 
+                ))
+
+        st.plotly_chart(fig_count, use_container_width=True)
+
+
+
+    # Sub-Question 2
+    elif sub_question == "2. Transaction trends across states over time":
+        # Full result indexed by year, with the Year_Quarter label added once
+        def add_year_quarter(df):
+            df['Year_Quarter'] = df['Years'].astype(str) + " Q" + df['Quarter'].astype(str)
+            return df
+
+        result = indexed_result("transaction_trend_by_quarter", ["Years"], add_year_quarter)
+
+        #dropdown for year selection
+        years_options = result.options("Years")
+        selected_year = st.selectbox("Select a Year", years_options)
+
+        #rows of the selected year
+        filtered_df = result.lookup(selected_year)
+
+
+        # Line chart for Transaction Amount and Count across Quarters
+        col1, col2 = st.columns(2)
+        with col1:
+                st.plotly_chart(timed_figure(
+                    ("transaction_trend_by_quarter", "amount"),
+                    lambda: px.line(filtered_df, 
+                            x="Year_Quarter", 
+                            y="Total_Transaction_Amount", 
+                            markers=True, 
+                            title="Transaction Amount Trend Across Quarters"))
+                )
+        with col2:
+                st.plotly_chart(timed_figure(
+                    ("transaction_trend_by_quarter", "count"),
+                    lambda: px.line(filtered_df, 
+                            x="Year_Quarter", 
+                            y="Total_Transaction_Count", 
+                            markers=True, 
+                            title="Transaction Count Trend Across Quarters"))
+                             )
+
+        #Bar chart using matplotlib
+        st.subheader(f" Transactions for years {selected_year}")
+        def build_bar():
+            fig, ax = matplotlib_figure(figsize=(10,6))
+            ax.bar(filtered_df["Quarter"].astype(str), filtered_df["Total_Transaction_Amount"], color= "skyblue")
+            ax.set_xlabel("Quarter")
+            ax.set_ylabel("Total Transaction Amount")
+            ax.set_title(f"Transaction Amount Distribution for {selected_year}")
+            ax.tick_params(axis="x", labelrotation=0)
+            return fig
+
+        st.pyplot(timed_figure(("transaction_trend_by_quarter", "bar"), build_bar))
+
+
+
+
+    # Sub-Question 3: Top Growing Payment Categories by States and Year
+    elif sub_question == "3. Top growing payment categories by states and year":
+
+        # Ensure the correct data types
+        def convert_types(df):
+            df['Transaction_type'] = df['Transaction_type'].astype(str)
+            df['Total_Amount'] = df['Total_Amount'].astype(float)
+            df['Year'] = df['Year'].astype(int)
+            # Year-over-year growth of every state and payment category
+            return growth.add_growth(df, ["States", "Transaction_type"], "Total_Amount", time=["Year"])
+
+        # Run the query (once per session and data version) and index it by state and year
+        result = indexed_result("payment_categories_by_state_year", ["States", "Year"], convert_types)
+
+        # Display the full result DataFrame
+        st.markdown("### Top Growing Payment Categories by States and Year")
+
+        # Selectbox for the user to choose a state
+        selected_state = st.selectbox("Select a State", options=result.options('States'))
+
+        # Selectbox for the user to choose a year
+        selected_year = st.selectbox("Select a Year", options=result.options('Year'))
+
+        # Rows of the selected state and year
+        filtered_df = result.lookup(selected_state, selected_year)
+
+        # Display the filtered data
+        st.markdown(f"#### Payment Categories in {selected_state} for {selected_year}")
+        st.dataframe(filtered_df.drop(columns=["Period"]).sort_values("Growth_YoY", ascending=False))
+
+        # Year-over-year growth of every category (empty for the first year)
+        if filtered_df["Growth_YoY"].notna().any():
+            growth_fig = timed_figure(("payment_categories_by_state_year", "growth"), lambda: px.bar(
+                                filtered_df.sort_values("Growth_YoY", ascending=False),
+                                x="Transaction_type",
+                                y="Growth_YoY",
+                                title=f"Year-over-Year Growth by Payment Type in {selected_state} ({selected_year})",
+                                labels={"Transaction_type": "Type", "Growth_YoY": "YoY Growth"}))
+            growth_fig.update_yaxes(tickformat=".0%")
+            st.plotly_chart(growth_fig, use_container_width=True)
+
+        # Create a pie chart for transaction amount distribution by payment type for the selected state and year
+
+        pie_fig = timed_figure(("payment_categories_by_state_year", "pie"), lambda: px.pie(filtered_df, 
+                                names="Transaction_type", 
+                                values="Total_Amount",
+                                title=f"Transaction Amount Distribution by Payment Type in {selected_state} ({selected_year})",
+                                hole=0.4))  
+        st.plotly_chart(pie_fig, use_container_width=True)
+
+
+
+    # Sub-Question 4
+    elif sub_question == "4. Top 10 State-wise Total Transaction Amount":
+        result_df = run_named("top10_states_by_transaction_amount")
+
+
+        st.markdown("### Top 10 State-wise Total Transaction Amount")
+
+        fig = timed_figure(("top10_states_by_transaction_amount", "bar"), lambda: px.bar(
+                result_df, 
+                x="States", 
+                y="Total_Transaction_Amount",
+                text="Total_Transaction_Amount", 
+                title="Total Transaction Amount By State",
+                labels={
+                    "States": "State", 
+                    "Total_Transaction_Amount": "Transaction Amount"
+                }
+            ))
+
+
+        st.plotly_chart(fig)
+
+
+    # Sub-Question 5
+    if sub_question == "5. Total Transaction Amount Analysis":
+        df = run_named("transaction_year_quarters")
+
+        st.markdown("### Total Transaction Amount Analysis")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            y = st.select_slider("Years", list(df["Years"].unique()))
+        with col2:
+            q = st.select_slider("Quarter", list(df["Quarter"].unique()))
+        # The detail levels are the simplified variants built by geo.py
+        detail = "remote"
+        if geo.has_states():
+            with col3:
+                detail = st.select_slider("Map detail", list(geo.DETAIL_LEVELS), value="medium")
+
+        # Get map data and boundaries at the same time
+        df_map, boundaries = gather((map_data, int(y), int(q)), (geo.states_geojson, detail))
+
+        if boundaries is None:
+            st.warning("State boundaries not found (PHONEPE_REMOTE_GEOJSON=0). Run: python geo.py")
+        elif detail == "remote":
+            st.info("The state boundaries are downloaded from the remote GeoJSON. "
+                    "Run: python geo.py to store them locally with the map detail levels")
+
+        # Choropleth Map (built once per year, quarter and detail level)
+        def build_map():
+            fig = px.choropleth(
+                df_map,
+                geojson=boundaries,
+                featureidkey="properties.ST_NM",
+                locations="state",
+                color="Total_Transaction_Value",
+                hover_name="state",
+                hover_data={"Total_Transaction_Value": ":,.0f"},
+                color_continuous_scale="Rainbow"
+            )
+            fig.update_geos(fitbounds="locations", visible=False)
+            return fig
+
+        if boundaries is not None:
+            fig = cached_figure(("map_state_totals", int(y), int(q), detail), build_map)
+            st.plotly_chart(fig)
+
+        # Bar Chart
+        st.markdown("### State-wise Total Transaction Value")
+        bar_fig = timed_figure(("map_state_totals", int(y), int(q), "bar"), lambda: px.bar(
+            df_map.sort_values(by="Total_Transaction_Value", ascending=False),
+            x="state",
+            y="Total_Transaction_Value",
+            color="Total_Transaction_Value",
+            color_continuous_scale="Rainbow",
+            labels={"Total_Transaction_Value": "Transaction Value"},
+            title=f"Total Transaction Value by State - Q{q}, {y}"
+        ))
+        bar_fig.update_layout(xaxis_tickangle=-45)
+        st.plotly_chart(bar_fig)
+
+    # Sub-Question 6
+    if sub_question == "6. District-level Map by State":
+        df = run_named("map_state_year_quarters")
+
+        st.markdown("### District-level Map by State")
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            mode = st.selectbox("Show", list(DISTRICT_MAP_MODES))
+        with col2:
+            state = st.selectbox("State", list(df["States"].unique()))
+        with col3:
+            y = st.select_slider("Years", list(df["Years"].unique()), key="district_years")
+        with col4:
+            q = st.select_slider("Quarter", list(df["Quarter"].unique()), key="district_quarter")
+
+        df_map, districts = gather((district_map_data, mode, state, int(y), int(q)),
+                                   (geo.districts_geojson, state))
+
+        if districts is None:
+            st.warning("District boundaries not found. Run: python geo.py districts --source <districts.geojson>")
+        else:
+            def build_district_map():
+                fig = px.choropleth(
+                    df_map,
+                    geojson=districts,
+                    featureidkey=f"properties.{geo.DISTRICT_PROPERTY}",
+                    locations="district_key",
+                    color="Value",
+                    hover_name="district",
+                    hover_data={"district_key": False, "Value": ":,.0f"},
+                    color_continuous_scale="Rainbow"
+                )
+                fig.update_geos(fitbounds="locations", visible=False)
+                return fig
+
+            fig = cached_figure((DISTRICT_MAP_MODES[mode], state, int(y), int(q)), build_district_map)
+            st.plotly_chart(fig)
+
+        bar_fig = timed_figure((DISTRICT_MAP_MODES[mode], state, int(y), int(q), "bar"), lambda: px.bar(
+            df_map.sort_values(by="Value", ascending=False),
+            x="district",
+            y="Value",
+            color="Value",
+            color_continuous_scale="Rainbow",
+            labels={"district": "District", "Value": mode},
+            title=f"{mode} by District in {state} - Q{q}, {y}"
+        ))
+        bar_fig.update_layout(xaxis_tickangle=-45)
+        st.plotly_chart(bar_fig)
+
+    return sub_question
@@ -0,0 +1,112 @@
+# Business case 4: user engagement and growth strategy
+import plotly.express as px
+import streamlit as st
+
+import growth
+from cases.common import growth_result, run_named, timed_figure
+
+
+# Function to render the case and return the selected sub-question
+def render():
+    st.subheader(" Business Case 4: User Engagement and Growth Strategy") 
+
+    sub_question = st.selectbox(
+        "Select a Sub-Question",
+        [
+            "1. Total Registered Users by State",
+            "2. User Growth Over Time",
+            "3. App Open Frequency by State",
+            "4. Top Districts by User Count"                
+        ]
+        )
+    # Sub-Question 1
+    if sub_question == "1. Total Registered Users by State":
+        df = run_named("registered_users_by_state")
+        st.markdown("### Total Registered Users by State")
+
+        #Creating the bar chart
+        fig = timed_figure(("registered_users_by_state", "bar"), lambda: px.bar(df, x='States', y='Total_Users',
+                    title="Total Registered Users by State",
+                    labels={'Total_Users': 'Registered Users'},
+                    color='Total_Users',
+                    color_continuous_scale='Blues'))
+
+        fig.update_layout(xaxis_tickangle=-45)
+
+        st.plotly_chart(fig)
+
+    # Sub-Question 2
+    elif sub_question == "2. User Growth Over Time":
+        # Registered users are already a running total per quarter: no cumsum needed,
+        # the growth columns come from growth.add_growth
+        df = growth_result("registered_users_by_quarter", "growth",
+                           lambda df: growth.add_growth(df, [], "Total_Users"))
+
+        # Create Year_Quarter label
+        df["Year_Quarter"] = df["Years"].astype(str) + " Q" + df["Quarter"].astype(str)
+
+        st.markdown("### User Growth Over Time")
+
+        # Plot using Plotly for labeled axes
+        fig = timed_figure(("registered_users_by_quarter", "line"), lambda: px.line(
+            df,
+            x="Year_Quarter",
+            y="Total_Users",
+            title="Registered User Growth Over Time",
+            labels={"Year_Quarter": "Quarter", "Total_Users": "Total Registered Users"},
+            height=500,
+            width=800
+        ))
+        fig.update_layout(xaxis_tickangle=-45)
+        st.plotly_chart(fig, use_container_width=True)
+
+        # Quarter-over-quarter and year-over-year growth
+        growth_fig = timed_figure(("registered_users_by_quarter", "growth"), lambda: px.bar(
+            df,
+            x="Year_Quarter",
+            y=["Growth_QoQ", "Growth_YoY"],
+            barmode="group",
+            title="Registered User Growth Rate",
+            labels={"Year_Quarter": "Quarter", "value": "Growth", "variable": ""},
+            height=500
+        ))
+        growth_fig.update_yaxes(tickformat=".0%")
+        growth_fig.update_layout(xaxis_tickangle=-45)
+        st.plotly_chart(growth_fig, use_container_width=True)
+
+
+    # Sub-Question 3
+    elif sub_question == "3. App Open Frequency by State":
+        df = run_named("app_opens_by_state")
+        st.markdown("### App Open Frequency by State")
+
+        fig = timed_figure(("app_opens_by_state", "bar"), lambda: px.bar(
+            df, 
+            x='States', 
+            y='Total_App_Opens',
+            title="App Open Frequency by State",
+            labels={'Total_App_Opens': 'Total App Opens'},
+            color='Total_App_Opens',
+            color_continuous_scale='Blues'  
+        ))
+        st.plotly_chart(fig)
+
+
+    # Sub-Question 4
+    elif sub_question == "4. Top Districts by User Count":
+        df = run_named("top10_districts_by_user_count")
+        st.markdown("### Top 10 Districts by Registered Users")
+        fig = timed_figure(("top10_districts_by_user_count", "bar"), lambda: px.bar(
+            df,
+            x='Districts',
+            y='Total_Users',
+            title='Top 10 Districts by Registered Users',
+            labels={'Total_Users': 'Registered Users'},
+            color='Total_Users',
+            color_continuous_scale='Teal',
+            height=500,
+            width=800
+            ))
+        st.plotly_chart(fig)
+
+    return sub_question
@@ -0,0 +1,59 @@
+import threading
+from collections import OrderedDict
+
+
+# Line and scatter charts with more points than this are drawn with WebGL
+# (Scattergl) instead of SVG: the browser stays responsive with many traces
+WEBGL_POINTS = 1000
+
+
+# Function to get the Plotly Express render_mode for the rows of a chart
+def render_mode(df):
+    return "webgl" if len(df) > WEBGL_POINTS else "svg"
+
+
+# Bounded LRU cache of built figures shared by every session, keyed by the data
+# version and a chart spec (query name, widget values, chart variant). Figures are
+# never changed after they are built, so the same object can be sent to any session.
+class FigureCache:
+    def __init__(self, max_size=64):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    # Function to get a cached figure or build and cache it
+    def get_or_build(self, version, spec, build):
+        key = (version, spec)
+        with self._lock:
+            figure = self._entries.get(key)
+            if figure is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return figure
+        self.misses += 1
+        figure = build()
+        with self._lock:
+            self._entries[key] = figure
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return figure
+
+    # Function to drop every cached figure
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+FIGURE_CACHE = FigureCache()
+
+
+# Function to create a matplotlib figure that isn't registered with pyplot, so it
+# is freed with its last reference instead of piling up in pyplot's figure list
+def matplotlib_figure(figsize=(10, 6)):
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=figsize)
+    return figure, figure.subplots()
@@ -0,0 +1,170 @@
+import os
+import time
+import queue
+import threading
+from contextlib import contextmanager
+
+import pymysql
+
+
+# MySQL connection settings (can be overridden with environment variables)
+DB_CONFIG = {
+    "host": os.environ.get("PHONEPE_DB_HOST", "127.0.0.1"),
+    "port": int(os.environ.get("PHONEPE_DB_PORT", "3306")),
+    "user": os.environ.get("PHONEPE_DB_USER", "root"),
+    "password": os.environ.get("PHONEPE_DB_PASSWORD", "Abby@123"),
+    "database": os.environ.get("PHONEPE_DB_NAME", "phonepe_data"),
+}
+
+
+# Errors after which a connection is not reused: lost connection (OperationalError)
+# or a socket already closed (InterfaceError)
+CONNECTION_ERRORS = (pymysql.err.OperationalError, pymysql.err.InterfaceError)
+
+
+# Function to open a new connection to the phonepe_data database
+def get_connection(**kwargs):
+    return pymysql.connect(**{**DB_CONFIG, **kwargs})
+
+
+# Bounded pool of connections shared by every dashboard session.
+# Idle connections are pinged (and reconnected) before being handed out again,
+# and a connection that fails during a query is thrown away instead of reused.
+class ConnectionPool:
+    def __init__(self, max_size=8, timeout=30, check_after=30, **settings):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check_after = check_after
+        self.settings = settings
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+
+    # Function to take a healthy connection out of the pool (or open a new one)
+    def _acquire(self):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError(f"no free database connection after {self.timeout}s")
+        try:
+            try:
+                connection, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return get_connection(**self.settings)
+            if time.monotonic() - last_used > self.check_after:
+                connection.ping(reconnect=True)
+            return connection
+        except Exception:
+            self._slots.release()
+            raise
+
+    # Function to give a connection back to the pool
+    def _release(self, connection, broken=False):
+        try:
+            if broken:
+                connection.close()
+            else:
+                self._idle.put((connection, time.monotonic()))
+        except pymysql.err.Error:
+            pass
+        finally:
+            self._slots.release()
+
+    # Context manager lending a connection for the duration of a with block.
+    # The connection always goes back to the pool (closed if it is broken, or if
+    # the rollback after an error fails).
+    @contextmanager
+    def connection(self):
+        connection = self._acquire()
+        broken = False
+        try:
+            yield connection
+        except CONNECTION_ERRORS:
+            broken = True
+            raise
+        except BaseException:
+            try:
+                connection.rollback()
+            except Exception:
+                broken = True
+            raise
+        finally:
+            self._release(connection, broken)
+
+    # Function to close every idle connection
+    def close(self):
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            connection.close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+# Function to get the pool shared by the dashboard (created on first use)
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(max_size=int(os.environ.get("PHONEPE_DB_POOL_SIZE", "8")))
+        return _pool
+
+
+# Function to run a SELECT in a read-only transaction on a pooled connection.
+# Returns the column names and the rows. A query that fails because the
+# connection was lost is retried once on a fresh connection.
+def read_query(query, params=None, retries=1):
+    try:
+        with get_pool().connection() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute("START TRANSACTION READ ONLY")
+                cursor.execute(query, params)
+                rows = cursor.fetchall()
+                columns = [col[0] for col in cursor.description]
+            connection.commit()
+            return columns, rows
+    except CONNECTION_ERRORS:
+        if retries <= 0:
+            raise
+        return read_query(query, params, retries - 1)
+
+
+# Function to prepare a statement on a connection, once per server session.
+# A reconnect (new thread id) starts a new session without the old statements.
+def _prepare(connection, cursor, name, query):
+    prepared = getattr(connection, "prepared_statements", None)
+    if prepared is None or prepared[0] != connection.thread_id():
+        prepared = (connection.thread_id(), set())
+        connection.prepared_statements = prepared
+    if name not in prepared[1]:
+        cursor.execute(f"PREPARE {name} FROM %s", (query.replace("%s", "?"),))
+        prepared[1].add(name)
+
+
+# Function to run a registry query as a server-side prepared statement.
+# pymysql has no binary protocol, so this uses SQL PREPARE / EXECUTE USING with
+# user variables: the statement is parsed once per pooled connection and only
+# the parameter values are sent afterwards.
+def read_prepared(name, query, params=(), retries=1):
+    statement = f"q_{name}"
+    variables = [f"@{statement}_{i}" for i in range(len(params))]
+    try:
+        with get_pool().connection() as connection:
+            with connection.cursor() as cursor:
+                _prepare(connection, cursor, statement, query)
+                cursor.execute("START TRANSACTION READ ONLY")
+                if params:
+                    cursor.execute(
+                        "SET " + ", ".join(f"{variable} = %s" for variable in variables), params)
+                    cursor.execute(f"EXECUTE {statement} USING {', '.join(variables)}")
+                else:
+                    cursor.execute(f"EXECUTE {statement}")
+                rows = cursor.fetchall()
+                columns = [col[0] for col in cursor.description]
+            connection.commit()
+            return columns, rows
+    except CONNECTION_ERRORS:
+        if retries <= 0:
+            raise
+        return read_prepared(name, query, params, retries - 1)
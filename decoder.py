@@ -0,0 +1,213 @@
+# JSON decoding of the Pulse files. Whole files are decoded with orjson when it is
+# installed (pip install orjson) and with the json module otherwise. Files larger
+# than STREAM_BYTES are read incrementally: only the entries of the list (or
+# object) holding the rows are decoded, one at a time, so an oversized file is
+# never held in memory as a whole.
+import os
+import re
+import json
+
+
+# Decoder of whole files: "auto" (orjson if installed), "orjson" or "json"
+BACKEND = os.environ.get("PHONEPE_JSON_BACKEND", "auto")
+
+# Files larger than this are decoded incrementally (see iter_entries)
+STREAM_BYTES = int(os.environ.get("PHONEPE_JSON_STREAM_BYTES", 8 * 2 ** 20))
+
+# Characters read at a time by the incremental decoder
+CHUNK_SIZE = 2 ** 16
+
+_WHITESPACE = " \t\n\r"
+
+# Characters that can continue a number
+_NUMBER_CHARS = "0123456789+-.eE"
+
+# Characters that matter when skipping a value: in a string its end or an escape,
+# outside strings the start of a string and the brackets
+_STRING_STOP = re.compile(r'["\\]')
+_STRUCTURE = re.compile(r'["\[\]{}]')
+
+
+# Function to get the function decoding a whole document (bytes or str)
+def _get_loads():
+    if BACKEND in ("auto", "orjson"):
+        try:
+            import orjson
+            return orjson.loads
+        except ImportError:
+            if BACKEND == "orjson":
+                raise
+    if BACKEND not in ("auto", "orjson", "json"):
+        raise ValueError(f"unknown JSON backend '{BACKEND}' (auto, orjson or json)")
+    return json.loads
+
+
+loads = _get_loads()
+
+
+# Function to decode a whole file (read as bytes: both decoders take UTF-8 bytes)
+def load(path):
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+# Buffered reader of a JSON text, decoding one value at a time with the json
+# module. A value is decoded once it is complete in the buffer: more text is read
+# until it is (a number is complete only when a character that can't continue it
+# follows, e.g. "1" of "1e-7" isn't).
+class _Stream:
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    # Function to read more text; False at the end of the file
+    def _fill(self):
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    # Function to get the next character that isn't whitespace (without consuming it)
+    def peek(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                raise ValueError("unexpected end of JSON document")
+
+    # Function to consume the next non-whitespace character, which must be char
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"expected '{char}' at position {self.pos}, found '{found}'")
+        self.pos += 1
+
+    # Function to consume the separator after an entry; True if another entry follows
+    def next_entry(self, close):
+        char = self.peek()
+        self.pos += 1
+        if char == ",":
+            return True
+        if char == close:
+            return False
+        raise ValueError(f"expected ',' or '{close}' at position {self.pos - 1}, found '{char}'")
+
+    # Function to decode the next value
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                if self.eof or end < len(self.buffer) and self.buffer[end] not in _NUMBER_CHARS:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+    # Function to consume the next value without decoding it: strings, lists and
+    # objects are scanned for their end, so skipping a large value is one pass over
+    # it (value() would decode it again after every chunk read). Numbers and
+    # literals are short and decoded.
+    def skip(self):
+        if self.peek() not in '"[{':
+            self.value()
+            return
+        depth = 0
+        in_string = False
+        escaped = False
+        while True:
+            buffer, pos = self.buffer, self.pos
+            while pos < len(buffer):
+                if escaped:
+                    pos += 1
+                    escaped = False
+                    continue
+                match = (_STRING_STOP if in_string else _STRUCTURE).search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+                pos = match.end()
+                char = match.group()
+                if char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = not in_string
+                    if not in_string and depth == 0:
+                        self.pos = pos
+                        return
+                elif char in "[{":
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        self.pos = pos
+                        return
+            self.pos = pos
+            if not self._fill():
+                raise ValueError("unexpected end of JSON document")
+
+    # Function to iterate over the (key, value) pairs of the object starting here.
+    # The value is not consumed: the caller decodes it (value) or descends into it.
+    def keys(self):
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if not self.next_entry("}"):
+                return
+
+
+# Function to decode the entries found at keys (e.g. ("data", "pincodes")) one at a
+# time: the items of a list, or the (key, value) pairs of an object. Everything
+# else in the file is skipped, a null or missing entry gives no items.
+def iter_entries(path, keys):
+    with open(path, "r", encoding="utf-8") as f:
+        stream = _Stream(f)
+        yield from _entries(stream, list(keys))
+
+
+# Function to walk the stream down to keys and yield the entries found there
+def _entries(stream, keys):
+    if not keys:
+        char = stream.peek()
+        if char == "[":
+            stream.pos += 1
+            if stream.peek() == "]":
+                stream.pos += 1
+                return
+            while True:
+                yield stream.value()
+                if not stream.next_entry("]"):
+                    return
+        elif char == "{":
+            for key in stream.keys():
+                yield key, stream.value()
+        else:
+            stream.skip()
+        return
+
+    if stream.peek() != "{":
+        stream.skip()
+        return
+    for key in stream.keys():
+        if key == keys[0]:
+            yield from _entries(stream, keys[1:])
+        else:
+            stream.skip()
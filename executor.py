@@ -0,0 +1,37 @@
+import os
+import time
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+
+
+# Threads running the independent queries of a page (shared by every dashboard
+# session, like the query cache). Defaults to the size of the connection pool:
+# more threads would only wait for a connection.
+QUERY_THREADS = int(os.environ.get("PHONEPE_QUERY_THREADS",
+                                   os.environ.get("PHONEPE_DB_POOL_SIZE", "8")))
+
+_executor = ThreadPoolExecutor(max_workers=QUERY_THREADS, thread_name_prefix="query")
+
+
+# Function to start a call in the background; returns a Future.
+# The call runs in a copy of the caller's context (see metrics.current_page).
+def submit(function, *args):
+    return _executor.submit(contextvars.copy_context().run, function, *args)
+
+
+# Function to run independent calls concurrently and return their results in order,
+# so a page waits for its slowest query instead of the sum of all of them.
+# Every call is a (function, *args) tuple,
+# e.g. gather((run_named, "transaction_volume_by_state"), (map_data, 2023, 1)).
+# The functions must not call Streamlit (st.*) or gather() themselves.
+def gather(*calls):
+    if len(calls) == 1:
+        function, *args = calls[0]
+        return [function(*args)]
+    start = time.perf_counter()
+    futures = [submit(function, *args) for function, *args in calls]
+    results = [future.result() for future in futures]
+    metrics.record_wait(time.perf_counter() - start)
+    return results
@@ -0,0 +1,296 @@
+import os
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import decoder
+import states
+from buffers import ColumnBuffer
+
+
+# Folder of every Pulse dataset, relative to the "data" folder of the pulse checkout
+DATASET_PATHS = {
+    "aggregated_insurance": "aggregated/insurance/country/india/state",
+    "aggregated_transaction": "aggregated/transaction/country/india/state",
+    "aggregated_user": "aggregated/user/country/india/state",
+    "map_insurance": "map/insurance/hover/country/india/state",
+    "map_transaction": "map/transaction/hover/country/india/state",
+    "map_user": "map/user/hover/country/india/state",
+    "top_insurance": "top/insurance/country/india/state",
+    "top_transaction": "top/transaction/country/india/state",
+    "top_user": "top/user/country/india/state",
+}
+
+# Columns of every dataset (same order as the MySQL tables)
+COLUMNS = {
+    "aggregated_insurance": ["State_id", "Years", "Quarter", "Transaction_type",
+                             "Transaction_count", "Transaction_amount"],
+    "aggregated_transaction": ["State_id", "Years", "Quarter", "Transaction_type",
+                               "Transaction_count", "Transaction_amount"],
+    "aggregated_user": ["State_id", "Years", "Quarter", "Brands", "Transaction_count",
+                        "RegisteredUsers", "AppOpens", "Percentage"],
+    "map_insurance": ["State_id", "Years", "Quarter", "Districts",
+                      "Transaction_count", "Transaction_amount"],
+    "map_transaction": ["State_id", "Years", "Quarter", "Districts",
+                        "Transaction_count", "Transaction_amount"],
+    "map_user": ["State_id", "Years", "Quarter", "Districts",
+                 "RegisteredUsers", "AppOpens"],
+    "top_insurance": ["State_id", "Years", "Quarter", "Pincodes",
+                      "Transaction_count", "Transaction_amount"],
+    "top_transaction": ["State_id", "Years", "Quarter", "Pincodes",
+                        "Transaction_count", "Transaction_amount"],
+    "top_user": ["State_id", "Years", "Quarter", "Pincodes", "RegisteredUsers"],
+}
+
+# pandas dtypes of the extracted columns: small ints for the ids, year and quarter,
+# categoricals for the repeated dimension strings, 64-bit numbers for the metrics
+DTYPES = {
+    "State_id": "int16",
+    "Years": "int16",
+    "Quarter": "int8",
+    "Transaction_type": "category",
+    "Brands": "category",
+    "Districts": "category",
+    "Pincodes": "category",
+    "Transaction_count": "int64",
+    "Transaction_amount": "float64",
+    "RegisteredUsers": "int64",
+    "AppOpens": "int64",
+    "Percentage": "float64",
+}
+
+
+# Parsers: each one turns the JSON of one quarter file into rows
+# (without the State_id, Years, Quarter columns which come from the folder names).
+# Most file kinds are a list (or object) of entries under "data": ENTRIES gives its
+# keys and the function reading one entry, so the same fast path works on a
+# decoded document and on the entries of an oversized file read incrementally.
+
+# aggregated/insurance and aggregated/transaction
+def aggregated_transaction_entry(i):
+    instrument = i["paymentInstruments"][0]
+    return i["name"], instrument["count"], instrument["amount"]
+
+
+# map/insurance and map/transaction
+def map_transaction_entry(i):
+    metric = i["metric"][0]
+    return i["name"], metric["count"], metric["amount"]
+
+
+# map/user (a district -> values object)
+def map_user_entry(item):
+    district, values = item
+    return district, values["registeredUsers"], values["appOpens"]
+
+
+# top/insurance and top/transaction
+def top_transaction_entry(i):
+    metric = i["metric"]
+    return i["entityName"], metric["count"], metric["amount"]
+
+
+# top/user
+def top_user_entry(i):
+    return i["name"], i["registeredUsers"]
+
+
+ENTRIES = {
+    "aggregated_insurance": (("data", "transactionData"), aggregated_transaction_entry),
+    "aggregated_transaction": (("data", "transactionData"), aggregated_transaction_entry),
+    "map_insurance": (("data", "hoverDataList"), map_transaction_entry),
+    "map_transaction": (("data", "hoverDataList"), map_transaction_entry),
+    "map_user": (("data", "hoverData"), map_user_entry),
+    "top_insurance": (("data", "pincodes"), top_transaction_entry),
+    "top_transaction": (("data", "pincodes"), top_transaction_entry),
+    "top_user": (("data", "pincodes"), top_user_entry),
+}
+
+
+# Function to get the rows of a decoded file of one of the ENTRIES kinds
+def parse_entries(dataset, data):
+    keys, entry = ENTRIES[dataset]
+    for key in keys:
+        data = data.get(key) if data else None
+    if isinstance(data, dict):
+        data = data.items()
+    return [entry(i) for i in data or []]
+
+
+# aggregated/user (files without usersByDevice have no rows)
+def parse_aggregated_user(data):
+    aggregated = data["data"]["aggregated"]
+    registered_users = aggregated["registeredUsers"]
+    app_opens = aggregated["appOpens"]
+    rows = []
+    for device in data["data"].get("usersByDevice") or []:
+        rows.append((device["brand"], device["count"], registered_users,
+                     app_opens, device["percentage"]))
+    return rows
+
+
+# Function to read the rows of one file: decoded whole (orjson when installed),
+# or entry by entry when it is larger than decoder.STREAM_BYTES
+def parse_file(dataset, path):
+    if dataset in ENTRIES and os.path.getsize(path) > decoder.STREAM_BYTES:
+        keys, entry = ENTRIES[dataset]
+        return [entry(i) for i in decoder.iter_entries(path, keys)]
+    data = decoder.load(path)
+    if dataset == "aggregated_user":
+        return parse_aggregated_user(data)
+    return parse_entries(dataset, data)
+
+
+# Function to list the quarter files of a dataset as (state_id, year, quarter, path)
+def list_files(root, dataset):
+    base = os.path.join(root, DATASET_PATHS[dataset])
+    for state in sorted(os.listdir(base)):
+        state_path = os.path.join(base, state)
+        if not os.path.isdir(state_path):
+            continue
+        # State folder is mapped to its State_id once per folder, not once per row
+        state_id = states.state_id(state)
+        for year in sorted(os.listdir(state_path)):
+            year_path = os.path.join(state_path, year)
+            if not year.isdigit() or not os.path.isdir(year_path):
+                continue
+            for file in sorted(os.listdir(year_path)):
+                quarter, ext = os.path.splitext(file)
+                if ext != ".json" or not quarter.isdigit():
+                    continue
+                yield state_id, int(year), int(quarter), os.path.join(year_path, file)
+
+
+# Function to create an empty column batch of a dataset (see buffers.py)
+def new_batch(dataset):
+    return ColumnBuffer(COLUMNS[dataset], DTYPES)
+
+
+# Errors of a file that can't be read: malformed JSON, a missing field, a value
+# that doesn't fit its column (None, a string in a number column, a huge number)
+FILE_ERRORS = (ValueError, KeyError, IndexError, TypeError, AttributeError, OverflowError)
+
+
+# Function to parse a group of files into one column batch (runs in a worker process).
+# The rows of every file are recorded with its path in batch.sources; a file that
+# can't be read is recorded in batch.errors instead (see raise_errors and validate.py).
+def parse_files(dataset, files):
+    batch = new_batch(dataset)
+    for state_id, year, quarter, path in files:
+        try:
+            batch.extend((state_id, year, quarter), parse_file(dataset, path), path)
+        except FILE_ERRORS as error:
+            batch.errors.append((path, f"{type(error).__name__}: {error}"))
+    return batch
+
+
+# Function to pass batches through, stopping at the first file that couldn't be read
+def raise_errors(batches):
+    for batch in batches:
+        if batch.errors:
+            path, message = batch.errors[0]
+            raise ValueError(f"{path}: {message}")
+        yield batch
+
+
+# Function to split the file list into groups of files_per_batch
+def _chunks(files, files_per_batch):
+    chunk = []
+    for file in files:
+        chunk.append(file)
+        if len(chunk) == files_per_batch:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# Function to extract a dataset as a stream of column batches (ColumnBuffer).
+# Files are parsed in a process pool; only a few batches are in flight at a time
+# so the whole dataset is never held in memory at once.
+# workers=1 parses in the current process (handy for debugging).
+# files can be given to parse only part of the tree (see list_files for the format).
+# With strict, a file that can't be read stops the extraction; otherwise it is
+# left in batch.errors for the validation stage.
+def extract(root, dataset, workers=None, files_per_batch=64, files=None, strict=True):
+    batches = _extract(root, dataset, workers, files_per_batch, files)
+    return raise_errors(batches) if strict else batches
+
+
+# Function to extract a dataset without checking the batch errors (see extract)
+def _extract(root, dataset, workers, files_per_batch, files):
+    if files is None:
+        files = list_files(root, dataset)
+    chunks = _chunks(files, files_per_batch)
+
+    if workers == 1:
+        for chunk in chunks:
+            yield parse_files(dataset, chunk)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        max_pending = 2 * workers
+        pending = []
+        for chunk in chunks:
+            pending.append(pool.submit(parse_files, dataset, chunk))
+            if len(pending) >= max_pending:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+# Function to build one typed DataFrame from a stream of column batches.
+# Each batch becomes a DataFrame over its buffers on arrival. The categories are
+# unified before the concat, otherwise pandas falls back to object columns.
+def to_frame(dataset, batches):
+    import pandas as pd
+
+    frames = [batch.to_frame() for batch in batches]
+    if not frames:
+        return new_batch(dataset).to_frame()
+    for column in COLUMNS[dataset]:
+        if DTYPES[column] != "category":
+            continue
+        categories = pd.Index([])
+        for frame in frames:
+            categories = categories.union(frame[column].cat.categories)
+        for frame in frames:
+            frame[column] = frame[column].cat.set_categories(categories)
+    return pd.concat(frames, ignore_index=True)
+
+
+# Function to report the memory used by extracted DataFrames ({table: DataFrame})
+def memory_report(frames):
+    import pandas as pd
+
+    report = []
+    for table, df in frames.items():
+        memory = int(df.memory_usage(index=False, deep=True).sum())
+        report.append({
+            "table": table,
+            "rows": len(df),
+            "memory_mb": round(memory / 2 ** 20, 2),
+            "bytes_per_row": round(memory / len(df), 1) if len(df) else 0,
+        })
+    return pd.DataFrame(report)
+
+
+# Function to extract several datasets, yielding (dataset, batch) pairs
+def extract_all(root, datasets=None, workers=None, files_per_batch=64):
+    for dataset in datasets or DATASET_PATHS:
+        for batch in extract(root, dataset, workers, files_per_batch):
+            yield dataset, batch
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract the PhonePe Pulse JSON data")
+    parser.add_argument("root", help="path to the 'data' folder of the pulse checkout")
+    parser.add_argument("--dataset", action="append", choices=list(DATASET_PATHS))
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    for dataset in args.dataset or DATASET_PATHS:
+        rows = 0
+        for batch in extract(args.root, dataset, args.workers):
+            rows += len(batch["State_id"])
+        print(f"{dataset}: {rows} rows")
@@ -0,0 +1,307 @@
+import os
+import json
+import argparse
+import urllib.request
+from functools import lru_cache
+
+
+# Folder with the boundary files shipped with the project
+GEO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "geo")
+
+# Source of the India states boundaries (property ST_NM holds the state name)
+STATES_URL = ("https://gist.githubusercontent.com/jbrobst/56c13bbbf9d97d187fea01ca62ea5112/"
+              "raw/e388c4cae20aa53cb5090210a42ebb9b765c0a36/india_states.geojson")
+
+# Until the boundary files are built, the states map is drawn from STATES_URL
+# (without the simplified detail levels); PHONEPE_REMOTE_GEOJSON=0 turns this off
+REMOTE_STATES = os.environ.get("PHONEPE_REMOTE_GEOJSON", "1") == "1"
+
+# Simplification tolerance (in degrees) of every detail level; "full" is the original file
+DETAIL_LEVELS = {
+    "low": 0.05,
+    "medium": 0.01,
+    "high": 0.002,
+    "full": None,
+}
+
+
+# Properties of the district boundaries added by build_districts() to match Pulse names
+DISTRICT_STATE_PROPERTY = "pulse_state"
+DISTRICT_PROPERTY = "pulse_district"
+
+# Usual names of the state and district name properties in district boundary files
+# (matched without case), tried when the property isn't given
+STATE_PROPERTIES = ["st_nm", "state", "state_name", "st_name", "name_1"]
+DISTRICT_PROPERTIES = ["district", "dist_name", "district_name", "dtname", "name_2"]
+
+
+# Function to normalize a state or district name so Pulse and boundary names match
+# ("Bengaluru Urban District" and "bengaluru urban" give the same key)
+def name_key(name):
+    name = " ".join(str(name).lower().replace("&", "and").split())
+    if name.endswith(" district"):
+        name = name[:-len(" district")]
+    return name
+
+
+# Function to get the path of a boundary file for a detail level
+def geojson_path(name, detail="full"):
+    if detail == "full":
+        return os.path.join(GEO_DIR, f"{name}.geojson")
+    return os.path.join(GEO_DIR, f"{name}_{detail}.geojson")
+
+
+# Function to get the distance of point p from the segment a-b
+def _segment_distance(p, a, b):
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    if dx == 0 and dy == 0:
+        return ((p[0] - a[0]) ** 2 + (p[1] - a[1]) ** 2) ** 0.5
+    t = max(0.0, min(1.0, ((p[0] - a[0]) * dx + (p[1] - a[1]) * dy) / (dx * dx + dy * dy)))
+    x, y = a[0] + t * dx, a[1] + t * dy
+    return ((p[0] - x) ** 2 + (p[1] - y) ** 2) ** 0.5
+
+
+# Function to simplify a line with the Douglas-Peucker algorithm (without recursion)
+def simplify_line(points, tolerance):
+    if len(points) < 3:
+        return points
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        max_distance, index = 0.0, None
+        for i in range(start + 1, end):
+            distance = _segment_distance(points[i], points[start], points[end])
+            if distance > max_distance:
+                max_distance, index = distance, i
+        if index is not None and max_distance > tolerance:
+            keep[index] = True
+            stack.append((start, index))
+            stack.append((index, end))
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+# Function to get the polygons of a Polygon / MultiPolygon geometry
+def _polygons(geometry):
+    if geometry["type"] == "Polygon":
+        return [geometry["coordinates"]]
+    return geometry["coordinates"]
+
+
+# Function to find the junctions of the rings of a FeatureCollection: the points
+# where a border shared by two shapes starts or ends (the points have more than
+# two different neighbours over every ring they are part of)
+def find_junctions(geojson):
+    neighbours = {}
+    for feature in geojson["features"]:
+        for polygon in _polygons(feature["geometry"]):
+            for ring in polygon:
+                points = [tuple(point[:2]) for point in ring[:-1]]
+                for i, point in enumerate(points):
+                    neighbours.setdefault(point, set()).update(
+                        (points[i - 1], points[(i + 1) % len(points)]))
+    return {point for point, around in neighbours.items() if len(around) > 2}
+
+
+# Function to simplify one arc between two junctions. A shared arc is simplified
+# once (arcs caches it by its points, in either direction), so both shapes get
+# the same simplified border and no gap or overlap opens between them.
+def _simplify_arc(arc, tolerance, arcs):
+    key = tuple(arc)
+    canonical = min(key, key[::-1])
+    if canonical not in arcs:
+        arcs[canonical] = simplify_line(list(canonical), tolerance)
+    simplified = arcs[canonical]
+    return simplified if canonical == key else simplified[::-1]
+
+
+# Function to simplify a closed ring arc by arc, keeping its junctions
+def _simplify_shared_ring(ring, tolerance, junctions, arcs):
+    points = [tuple(point[:2]) for point in ring[:-1]]
+    if len(points) < 3:
+        return ring
+    cuts = [i for i, point in enumerate(points) if point in junctions]
+    # A ring without junctions starts at its smallest point, so a ring shared as a
+    # whole (an enclave) is cut at the same place from both sides
+    if not cuts:
+        cuts = [points.index(min(points))]
+    start = cuts[0]
+    points = points[start:] + points[:start]
+    bounds = sorted((i - start) % len(points) for i in cuts) + [len(points)]
+    closed = points + [points[0]]
+    simplified = []
+    for first, last in zip(bounds, bounds[1:]):
+        simplified.extend(_simplify_arc(closed[first:last + 1], tolerance, arcs)[:-1])
+    return simplified + [simplified[0]]
+
+
+# Function to simplify one polygon ring; rings that collapse are dropped (None).
+# With junctions (see find_junctions) the borders shared with other shapes are
+# simplified the same way in every shape.
+def _simplify_ring(ring, tolerance, digits, junctions=None, arcs=None):
+    if junctions is None:
+        ring = simplify_line(ring, tolerance)
+    else:
+        ring = _simplify_shared_ring(ring, tolerance, junctions, arcs)
+    ring = [[round(x, digits), round(y, digits)] for x, y in ring]
+    if len(ring) < 4:
+        return None
+    return ring
+
+
+# Function to simplify a Polygon / MultiPolygon geometry
+# (junctions and arcs: see _simplify_ring)
+def simplify_geometry(geometry, tolerance, digits=4, junctions=None, arcs=None):
+    polygons = _polygons(geometry)
+
+    simplified = []
+    for polygon in polygons:
+        exterior = _simplify_ring(polygon[0], tolerance, digits, junctions, arcs)
+        if exterior is None:
+            continue
+        holes = [_simplify_ring(ring, tolerance, digits, junctions, arcs) for ring in polygon[1:]]
+        simplified.append([exterior] + [hole for hole in holes if hole is not None])
+
+    # Small islands can vanish completely; keep the largest original shape then
+    if not simplified:
+        largest = max(polygons, key=lambda polygon: len(polygon[0]))
+        simplified = [[[[round(x, digits), round(y, digits)] for x, y in largest[0]]]]
+
+    if len(simplified) == 1:
+        return {"type": "Polygon", "coordinates": simplified[0]}
+    return {"type": "MultiPolygon", "coordinates": simplified}
+
+
+# Function to build a simplified copy of a FeatureCollection. The borders shared
+# by neighbouring shapes are simplified once, so they stay identical (no gaps or
+# overlaps between states at the coarse detail levels).
+def simplify_geojson(geojson, tolerance):
+    junctions = find_junctions(geojson)
+    arcs = {}
+    features = []
+    for feature in geojson["features"]:
+        features.append({
+            "type": "Feature",
+            "properties": feature["properties"],
+            "geometry": simplify_geometry(feature["geometry"], tolerance, junctions=junctions,
+                                          arcs=arcs),
+        })
+    return {"type": "FeatureCollection", "features": features}
+
+
+# Function to write the full boundary file and its simplified variants
+def build(name, geojson):
+    os.makedirs(GEO_DIR, exist_ok=True)
+    for detail, tolerance in DETAIL_LEVELS.items():
+        data = geojson if tolerance is None else simplify_geojson(geojson, tolerance)
+        with open(geojson_path(name, detail), "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+
+
+# Function to load a boundary file once per process (later calls hit memory).
+# Falls back to the full file when a simplified variant hasn't been built.
+@lru_cache(maxsize=None)
+def load_geojson(name, detail="medium"):
+    path = geojson_path(name, detail)
+    if not os.path.exists(path):
+        path = geojson_path(name, "full")
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# Function to find the property holding a name in every feature: the given one, or
+# the first of candidates found (without case). Raises ValueError listing the
+# properties of the file when there is none.
+def find_property(geojson, candidates, given=None):
+    keys = set.intersection(*(set(feature["properties"]) for feature in geojson["features"]))
+    if given is not None:
+        if given not in keys:
+            raise ValueError(f"property '{given}' is not in every feature; found: {sorted(keys)}")
+        return given
+    by_lower = {key.lower(): key for key in keys}
+    for candidate in candidates:
+        if candidate in by_lower:
+            return by_lower[candidate]
+    raise ValueError(f"none of {candidates} is in every feature; found: {sorted(keys)}")
+
+
+# Function to add the Pulse state and district keys to the district boundaries
+# (the name properties are found with find_property when not given). Returns the
+# name properties used.
+def build_districts(geojson, state_property=None, district_property=None):
+    state_property = find_property(geojson, STATE_PROPERTIES, state_property)
+    district_property = find_property(geojson, DISTRICT_PROPERTIES, district_property)
+    for feature in geojson["features"]:
+        properties = feature["properties"]
+        properties[DISTRICT_STATE_PROPERTY] = name_key(properties[state_property])
+        properties[DISTRICT_PROPERTY] = name_key(properties[district_property])
+    build("india_districts", geojson)
+    return state_property, district_property
+
+
+# Function to get the district boundaries of one state, cached per state and detail
+# (returns None when the district boundaries haven't been vendored)
+@lru_cache(maxsize=None)
+def districts_geojson(state, detail="medium"):
+    if not os.path.exists(geojson_path("india_districts", "full")):
+        return None
+    state = name_key(state)
+    features = [feature for feature in load_geojson("india_districts", detail)["features"]
+                if feature["properties"][DISTRICT_STATE_PROPERTY] == state]
+    return {"type": "FeatureCollection", "features": features}
+
+
+# Function to check if the states boundaries have been built into GEO_DIR
+def has_states():
+    return os.path.exists(geojson_path("india_states", "full"))
+
+
+# Function to get the India states boundaries for the choropleth.
+# Without the local files: STATES_URL if REMOTE_STATES is set, None otherwise.
+def states_geojson(detail="medium"):
+    if not has_states():
+        return STATES_URL if REMOTE_STATES else None
+    return load_geojson("india_states", detail)
+
+
+# Function to read a GeoJSON from a local path or a URL
+def _read_source(source):
+    if os.path.exists(source):
+        with open(source, "r", encoding="utf-8") as f:
+            return json.load(f)
+    with urllib.request.urlopen(source) as response:
+        return json.load(response)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Vendor the India boundaries and build the simplified variants")
+    parser.add_argument("layer", nargs="?", choices=["states", "districts"], default="states")
+    parser.add_argument("--source", help="URL or local path of the GeoJSON "
+                                         "(defaults to the states gist for 'states')")
+    parser.add_argument("--state-property",
+                        help="property with the state name in the district file "
+                             f"(default: the first of {', '.join(STATE_PROPERTIES)})")
+    parser.add_argument("--district-property",
+                        help="property with the district name in the district file "
+                             f"(default: the first of {', '.join(DISTRICT_PROPERTIES)})")
+    args = parser.parse_args()
+
+    if args.layer == "states":
+        build("india_states", _read_source(args.source or STATES_URL))
+        name = "india_states"
+    else:
+        if not args.source:
+            parser.error("--source is required for the district boundaries")
+        try:
+            used = build_districts(_read_source(args.source), args.state_property,
+                                   args.district_property)
+        except ValueError as error:
+            parser.error(str(error))
+        print("state and district name properties: {}, {}".format(*used))
+        name = "india_districts"
+
+    for detail in DETAIL_LEVELS:
+        path = geojson_path(name, detail)
+        print(f"{path}: {os.path.getsize(path) // 1024} KB")
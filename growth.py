@@ -0,0 +1,76 @@
+# Growth analytics over the year/quarter grain of a query result: QoQ / YoY
+# deltas, rolling averages, CAGR and fastest-growing rankings. Every function works
+# on all the series at once (one sort, merges on the period number and grouped
+# window functions), never with a Python loop over states or districts.
+
+import numpy as np
+
+
+# Function to number the periods of a result: Years * 4 + Quarter - 1 for a
+# quarterly result, Years for a yearly one (time is the list of time columns)
+def period_index(df, time):
+    if len(time) == 2:
+        return df[time[0]].astype(int) * 4 + df[time[1]].astype(int) - 1
+    return df[time[0]].astype(int)
+
+
+# Function to get the value of the same series lag periods earlier (NaN if missing).
+# Missing periods are handled because rows are matched on the period number.
+def _lagged(df, keys, value, lag):
+    previous = df[keys + ["Period", value]].copy()
+    previous["Period"] += lag
+    merged = df[keys + ["Period"]].merge(previous, on=keys + ["Period"], how="left")
+    return merged[value].to_numpy()
+
+
+# Function to add growth columns to a result with one row per series and period:
+#   Growth_QoQ (quarterly results only) and Growth_YoY as fractions,
+#   Delta_YoY as the absolute change, Rolling_avg over the last window rows of the series.
+# keys are the series columns (e.g. ["States"]), time the time columns.
+def add_growth(df, keys, value, time=("Years", "Quarter"), window=4):
+    keys, time = list(keys), list(time)
+    periods_per_year = 4 if len(time) == 2 else 1
+    df = df.copy()
+    df[value] = df[value].astype(float)
+    df["Period"] = period_index(df, time)
+    df = df.sort_values(keys + ["Period"], ignore_index=True)
+
+    if periods_per_year == 4:
+        df["Growth_QoQ"] = df[value] / _lagged(df, keys, value, 1) - 1
+    last_year = _lagged(df, keys, value, periods_per_year)
+    df["Delta_YoY"] = df[value] - last_year
+    df["Growth_YoY"] = df[value] / last_year - 1
+
+    grouped = df.groupby(keys, sort=False)[value] if keys else df[value]
+    rolling = grouped.rolling(window, min_periods=1).mean()
+    if keys:
+        rolling = rolling.reset_index(level=list(range(len(keys))), drop=True)
+    df["Rolling_avg"] = rolling.sort_index()
+    return df.replace([np.inf, -np.inf], np.nan)
+
+
+# Function to summarize the growth of every series: first and last value, CAGR
+# between the first and last period, and the latest YoY growth.
+# growth is the result of add_growth.
+def summarize(growth, keys, value, time=("Years", "Quarter")):
+    keys = list(keys)
+    periods_per_year = 4 if len(time) == 2 else 1
+    summary = growth.groupby(keys, sort=False).agg(
+        First=(value, "first"), Last=(value, "last"),
+        First_period=("Period", "first"), Last_period=("Period", "last"),
+        Latest_YoY=("Growth_YoY", "last"),
+    ).reset_index()
+
+    years = (summary["Last_period"] - summary["First_period"]) / periods_per_year
+    valid = (years > 0) & (summary["First"] > 0) & (summary["Last"] > 0)
+    ratio = summary["Last"].where(valid) / summary["First"].where(valid)
+    summary["CAGR"] = ratio ** (1 / years.where(valid)) - 1
+    return summary.drop(columns=["First_period", "Last_period"])
+
+
+# Function to rank the fastest-growing series by a summary column (CAGR or Latest_YoY)
+def fastest_growing(summary, by="CAGR", top=10):
+    ranked = summary.dropna(subset=[by]).sort_values(by, ascending=False).head(top)
+    ranked = ranked.reset_index(drop=True)
+    ranked.insert(0, "Rank", range(1, len(ranked) + 1))
+    return ranked
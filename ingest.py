@@ -0,0 +1,201 @@
+import os
+import time
+import hashlib
+import argparse
+
+import db
+import loader
+import pincodes
+import rollups
+import schema
+import storage
+import validate
+from extractor import DATASET_PATHS, extract, list_files
+
+
+# Function to compute the content hash of a file
+def file_hash(path):
+    sha1 = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            sha1.update(block)
+    return sha1.hexdigest()
+
+
+# Function to read the manifest of a dataset as {path: (size, mtime, hash)}
+def read_manifest(cursor, dataset):
+    cursor.execute(
+        "SELECT Path, Size, Mtime, Hash FROM ingest_manifest WHERE Dataset = %s",
+        (dataset,))
+    return {path: (size, mtime, hash_) for path, size, mtime, hash_ in cursor.fetchall()}
+
+
+# Function to find the files of a dataset that are new or changed since the last run.
+# Files with the same size and mtime are skipped without reading them; otherwise
+# the content hash decides (a touched but unchanged file is not reloaded).
+# Returns the changed files and the manifest rows to write for them.
+def find_changed_files(root, dataset, manifest):
+    changed = []
+    manifest_rows = []
+    for state, year, quarter, path in list_files(root, dataset):
+        rel_path = os.path.relpath(path, root).replace(os.sep, "/")
+        stat = os.stat(path)
+        known = manifest.get(rel_path)
+        if known and known[0] == stat.st_size and known[1] == stat.st_mtime:
+            continue
+        content_hash = file_hash(path)
+        manifest_rows.append((dataset, rel_path, stat.st_size, stat.st_mtime, content_hash))
+        if known and known[2] == content_hash:
+            continue
+        changed.append((state, year, quarter, path))
+    return changed, manifest_rows
+
+
+# Function to replace the slices of each batch: the old rows of the (state, year,
+# quarter) slice of every file in the batch are deleted just before the batch is
+# loaded, so a quarantined file keeps the rows loaded by an earlier run. A slice is
+# deleted once per run: two files of one slice (1.json and 01.json) can be in
+# different batches, and the second must not delete the rows of the first.
+def replace_slices(connection, dataset, batches, slices):
+    deleted = set()
+    for batch in batches:
+        pending = {slices[path] for path, _ in batch.sources} - deleted
+        if pending:
+            with connection.cursor() as cursor:
+                cursor.executemany(
+                    f"DELETE FROM {dataset} WHERE State_id = %s AND Years = %s AND Quarter = %s",
+                    sorted(pending))
+            deleted |= pending
+        yield batch
+
+
+# Function to load one dataset; only new or changed quarter files are parsed.
+# The rows of a changed file's (state, year, quarter) slice are replaced and the rows
+# are bulk loaded in chunks. The summary tables of the loaded years are refreshed
+# next and the manifest is written last, so if a run fails the files it did not
+# finish are simply loaded (and summarized) again by the next run.
+# With a validator (see validate.py) every batch is checked before it is loaded.
+def ingest_dataset(connection, root, dataset, workers=None, full=False,
+                   files_per_batch=64, chunk_size=5000, method="insert", validator=None):
+    start = time.perf_counter()
+    with connection.cursor() as cursor:
+        if full:
+            cursor.execute(f"DELETE FROM {dataset}")
+            cursor.execute("DELETE FROM ingest_manifest WHERE Dataset = %s", (dataset,))
+            manifest = {}
+        else:
+            manifest = read_manifest(cursor, dataset)
+
+        changed, manifest_rows = find_changed_files(root, dataset, manifest)
+    connection.commit()
+
+    # A handful of new files is faster to parse without a process pool
+    if len(changed) <= files_per_batch:
+        workers = 1
+
+    batches = extract(root, dataset, workers, files_per_batch, files=changed,
+                      strict=validator is None)
+    if validator is not None:
+        validator.check_grid(root, dataset)
+        batches = validator.checked(dataset, batches)
+    if not full:
+        slices = {path: (state, year, quarter) for state, year, quarter, path in changed}
+        batches = replace_slices(connection, dataset, batches, slices)
+    stats = loader.load_batches(connection, dataset, batches, chunk_size, method)
+
+    # Quarantined files stay out of the manifest: the next run reads them again
+    if validator is not None:
+        quarantined = validate.relative_paths(root, validator.quarantined)
+        manifest_rows = [row for row in manifest_rows if row[1] not in quarantined]
+
+    # Refreshing the summary tables for the years that were loaded and letting the
+    # dashboard caches know that the data changed
+    years = sorted({year for _, year, _, _ in changed})
+    if full or changed:
+        changes = {dataset: None if full else years}
+        rollups.refresh(connection, changes)
+        pincodes.refresh(connection, changes)
+        schema.bump_data_version(connection)
+
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            """
+            INSERT INTO ingest_manifest(Dataset, Path, Size, Mtime, Hash)
+            VALUES(%s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE Size = VALUES(Size), Mtime = VALUES(Mtime), Hash = VALUES(Hash)
+            """,
+            manifest_rows)
+    connection.commit()
+
+    return {
+        "dataset": dataset,
+        "files": len(changed),
+        "years": years,
+        "rows": stats["rows"],
+        "rows_per_second": stats["rows_per_second"],
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+# Function to run the ingest for several datasets (validator: see ingest_dataset)
+def ingest(root, datasets=None, workers=None, full=False, chunk_size=5000, method="insert",
+           validator=None):
+    connection = db.get_connection(local_infile=(method == "infile"))
+    try:
+        schema.create_tables(connection)
+        rollups.create_tables(connection)
+        pincodes.create_table(connection)
+        results = [ingest_dataset(connection, root, dataset, workers, full,
+                                  chunk_size=chunk_size, method=method, validator=validator)
+                   for dataset in datasets or DATASET_PATHS]
+        if validator is not None:
+            validator.check_cross_tables()
+        return results
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load the PhonePe Pulse data into MySQL")
+    parser.add_argument("root", help="path to the 'data' folder of the pulse checkout")
+    parser.add_argument("--dataset", action="append", choices=list(DATASET_PATHS))
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--full", action="store_true",
+                        help="reload every file instead of only new or changed ones")
+    parser.add_argument("--chunk-size", type=int, default=5000,
+                        help="rows sent (and committed) per chunk")
+    parser.add_argument("--method", choices=list(loader.LOAD_METHODS), default="insert",
+                        help="multi-row INSERT batches or LOAD DATA LOCAL INFILE")
+    parser.add_argument("--backend", choices=["mysql", "parquet"], default=storage.BACKEND,
+                        help="load into MySQL or into partitioned Parquet files")
+    parser.add_argument("--parquet-dir", default=storage.PARQUET_DIR)
+    parser.add_argument("--validate", choices=["off", "report", "quarantine"], default="report",
+                        help="data quality checks: report the issues, or also leave the "
+                             "files with errors out of the load")
+    parser.add_argument("--report", help="write the validation report to this file (JSON lines)")
+    args = parser.parse_args()
+
+    validator = None
+    if args.validate != "off":
+        validator = validate.Validator(quarantine=args.validate == "quarantine")
+
+    if args.backend == "parquet":
+        results = storage.ingest_parquet(args.root, args.parquet_dir, args.dataset,
+                                         args.workers, args.full, validator)
+        for result in results:
+            print(f"{result['dataset']}: {result['files']} files, "
+                  f"{result['rows']} rows in {result['seconds']}s")
+    else:
+        results = ingest(args.root, args.dataset, args.workers, args.full,
+                         args.chunk_size, args.method, validator)
+        for result in results:
+            print(f"{result['dataset']}: {result['files']} files, {result['rows']} rows "
+                  f"in {result['seconds']}s ({result['rows_per_second']} rows/s)")
+
+    if validator is not None:
+        print(f"validation: {len(validator.issues)} issues, "
+              f"{len(validator.quarantined)} files left out, {validator.seconds:.3f}s")
+        if validator.issues:
+            print(validator.summary().to_string(index=False))
+        if args.report:
+            validator.write_report(args.report)
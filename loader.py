@@ -0,0 +1,93 @@
+import os
+import time
+import tempfile
+from itertools import islice
+
+import schema
+
+
+# Function to split a stream of rows into lists of at most chunk_size rows
+def chunked(rows, chunk_size):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# Function to write one value in the MySQL tab-separated format
+def _tsv_value(value):
+    if value is None:
+        return "\\N"
+    return (str(value).replace("\\", "\\\\").replace("\t", "\\t")
+            .replace("\n", "\\n").replace("\r", "\\r"))
+
+
+# Function to load one chunk with multi-row INSERT ... ON DUPLICATE KEY UPDATE
+# (pymysql sends executemany of an INSERT ... VALUES as multi-row statements)
+def _insert_chunk(cursor, table, chunk):
+    cursor.executemany(schema.upsert_sql(table), chunk)
+
+
+# Function to load one chunk through LOAD DATA LOCAL INFILE
+# (the connection must be opened with local_infile=True)
+def _infile_chunk(cursor, table, chunk):
+    with tempfile.NamedTemporaryFile("w", suffix=".tsv", delete=False,
+                                     encoding="utf-8", newline="\n") as f:
+        for row in chunk:
+            f.write("\t".join(_tsv_value(value) for value in row))
+            f.write("\n")
+    try:
+        path = f.name.replace("\\", "/")
+        cursor.execute(
+            f"""
+            LOAD DATA LOCAL INFILE %s REPLACE INTO TABLE {table}
+            CHARACTER SET utf8mb4
+            FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n'
+            ({", ".join(schema.column_names(table))})
+            """,
+            (path,))
+    finally:
+        os.remove(f.name)
+
+
+LOAD_METHODS = {
+    "insert": _insert_chunk,
+    "infile": _infile_chunk,
+}
+
+
+# Function to bulk load a stream of row tuples into a table.
+# Rows are sent chunk by chunk with a commit after every chunk, so memory use is
+# bounded by chunk_size whatever the size of the table.
+# Returns the number of rows, the time taken and the rows/second.
+def load_rows(connection, table, rows, chunk_size=5000, method="insert"):
+    load_chunk = LOAD_METHODS[method]
+    start = time.perf_counter()
+    total = 0
+    with connection.cursor() as cursor:
+        for chunk in chunked(rows, chunk_size):
+            load_chunk(cursor, table, chunk)
+            connection.commit()
+            total += len(chunk)
+    seconds = time.perf_counter() - start
+    return {
+        "table": table,
+        "rows": total,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(total / seconds) if seconds else 0,
+    }
+
+
+# Function to bulk load the column batches produced by extractor.extract()
+def load_batches(connection, table, batches, chunk_size=5000, method="insert"):
+    names = schema.column_names(table)
+    rows = (row for batch in batches for row in zip(*[batch[name] for name in names]))
+    return load_rows(connection, table, rows, chunk_size, method)
+
+
+# Function to bulk load a DataFrame without converting it all to Python lists first
+def load_frame(connection, table, df, chunk_size=5000, method="insert"):
+    rows = df[schema.column_names(table)].itertuples(index=False, name=None)
+    return load_rows(connection, table, rows, chunk_size, method)
@@ -0,0 +1,213 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+import contextvars
+from collections import deque
+
+from cache import normalize_sql
+from queries import QUERIES
+
+
+# Every event is also written to this logger as one JSON object per line
+logger = logging.getLogger("phonepe.metrics")
+
+# Optional file receiving the same JSON lines (e.g. for a log shipper)
+METRICS_FILE = os.environ.get("PHONEPE_METRICS_FILE")
+
+# Page being rendered by the current script run. Context variables are per thread,
+# so concurrent sessions don't mix; executor.gather copies the context into its
+# threads so their queries are attributed to the page that started them.
+_current_page = contextvars.ContextVar("current_page", default=None)
+
+
+# Function to get a short hash identifying a query text
+def query_hash(sql):
+    return hashlib.sha1(normalize_sql(sql).encode("utf-8")).hexdigest()[:12]
+
+
+# Names of the known queries by hash (ad-hoc SQL is reported by hash only)
+QUERY_NAMES = {query_hash(sql): name for name, sql in QUERIES.items()}
+
+
+# Timings of one script run: queries, module imports and figure builds are kept
+# until the page name is known. start can be taken before the script's own imports.
+class Page:
+    def __init__(self, start=None):
+        self.thread = threading.current_thread()
+        self.start = time.perf_counter() if start is None else start
+        self.data_seconds = 0.0
+        self.import_seconds = 0.0
+        self.figure_seconds = 0.0
+        self.queries = []
+        self.imports = []
+        self.figures = []
+
+
+# Bounded in-memory store of the latest events, shared by every session
+class Recorder:
+    def __init__(self, max_events=5000, path=METRICS_FILE):
+        self.path = path
+        self.events = deque(maxlen=max_events)
+        self._lock = threading.Lock()
+
+    # Function to store, log and (optionally) append one event to the metrics file
+    def record(self, event):
+        event = {"time": round(time.time(), 3), **event}
+        line = json.dumps(event, default=str)
+        with self._lock:
+            self.events.append(event)
+            if self.path:
+                with open(self.path, "a") as f:
+                    f.write(line + "\n")
+        logger.info(line)
+
+    # Function to export the stored events as JSON lines
+    def export(self):
+        with self._lock:
+            events = list(self.events)
+        return "".join(json.dumps(event, default=str) + "\n" for event in events)
+
+    # Function to summarize the query events per query (slowest first)
+    def query_summary(self):
+        import pandas as pd
+
+        with self._lock:
+            events = [event for event in self.events if event["kind"] == "query"]
+        if not events:
+            return pd.DataFrame()
+        df = pd.DataFrame(events)
+        summary = df.groupby(["query", "hash"]).agg(
+            calls=("total_ms", "size"),
+            cache_hits=("cached", "sum"),
+            rows=("rows", "max"),
+            db_ms_p50=("db_ms", "median"),
+            db_ms_p95=("db_ms", lambda ms: ms.quantile(0.95)),
+            frame_ms_p50=("frame_ms", "median"),
+            total_ms_max=("total_ms", "max"),
+        )
+        return summary.sort_values("db_ms_p95", ascending=False).reset_index()
+
+
+    # Function to list the on-demand imports and the script runs that paid for them
+    def import_summary(self):
+        import pandas as pd
+
+        with self._lock:
+            events = [event for event in self.events if event["kind"] == "import"]
+        return pd.DataFrame(events, columns=["time", "module", "import_ms", "page"])
+
+    # Function to summarize the figure builds per figure (slowest first)
+    def figure_summary(self):
+        import pandas as pd
+
+        with self._lock:
+            events = [event for event in self.events if event["kind"] == "figure"]
+        if not events:
+            return pd.DataFrame()
+        df = pd.DataFrame(events)
+        summary = df.groupby(["figure", "page"]).agg(
+            calls=("build_ms", "size"),
+            cache_hits=("cached", "sum"),
+            build_ms_p50=("build_ms", "median"),
+            build_ms_max=("build_ms", "max"),
+        )
+        return summary.sort_values("build_ms_max", ascending=False).reset_index()
+
+
+RECORDER = Recorder()
+
+
+# Function to start timing a script run
+def start_page(start=None):
+    page = Page(start)
+    _current_page.set(page)
+    return page
+
+
+# Function to get the page of the running script (None outside a script run)
+def current_page():
+    return _current_page.get()
+
+
+# Function to record one query: DB time, DataFrame build time and rows.
+# Cache hits have no DB or build time.
+def record_query(sql, rows, db_seconds, frame_seconds, total_seconds, cached, name=None):
+    digest = query_hash(sql)
+    event = {
+        "kind": "query",
+        "query": name or QUERY_NAMES.get(digest, "ad-hoc"),
+        "hash": digest,
+        "rows": rows,
+        "cached": cached,
+        "db_ms": round(db_seconds * 1000, 3),
+        "frame_ms": round(frame_seconds * 1000, 3),
+        "total_ms": round(total_seconds * 1000, 3),
+    }
+    page = current_page()
+    if page is None:
+        RECORDER.record(event)
+        return
+    page.queries.append(event)
+    # Queries run by executor.gather are counted once, as the time gather waited
+    if threading.current_thread() is page.thread:
+        page.data_seconds += total_seconds
+
+
+# Function to add the time the script thread waited for concurrent queries
+def record_wait(seconds):
+    page = current_page()
+    if page is not None and threading.current_thread() is page.thread:
+        page.data_seconds += seconds
+
+
+# Function to record the import of a module on demand (e.g. a business case page)
+def record_import(module, seconds):
+    event = {"kind": "import", "module": module, "import_ms": round(seconds * 1000, 3)}
+    page = current_page()
+    if page is None:
+        RECORDER.record(event)
+        return
+    page.imports.append(event)
+    page.import_seconds += seconds
+
+
+# Function to record the build of a figure (Plotly Express or matplotlib) by its
+# spec; a figure served from the figure cache has no build time
+def record_figure(spec, seconds, cached=False):
+    event = {"kind": "figure", "figure": str(spec), "cached": cached,
+             "build_ms": round(seconds * 1000, 3)}
+    page = current_page()
+    if page is None:
+        RECORDER.record(event)
+        return
+    page.figures.append(event)
+    page.figure_seconds += seconds
+
+
+# Function to finish a script run: records its queries and figures and the page
+# timings. Render time is everything that wasn't spent waiting for data, importing
+# page modules or building figures (widgets, layout and sending the elements and
+# figures to the browser).
+def end_page(name):
+    page = current_page()
+    if page is None:
+        return []
+    _current_page.set(None)
+    total = time.perf_counter() - page.start
+    for event in page.queries + page.imports + page.figures:
+        RECORDER.record({**event, "page": name})
+    RECORDER.record({
+        "kind": "page",
+        "page": name,
+        "queries": len(page.queries),
+        "data_ms": round(page.data_seconds * 1000, 3),
+        "import_ms": round(page.import_seconds * 1000, 3),
+        "figure_ms": round(page.figure_seconds * 1000, 3),
+        "render_ms": round((total - page.data_seconds - page.import_seconds
+                            - page.figure_seconds) * 1000, 3),
+        "total_ms": round(total * 1000, 3),
+    })
+    return page.queries
@@ -0,0 +1,112 @@
+# Pincode analytics: the top pincodes of every (state, year, quarter) window with
+# their rank in the previous quarter. The windows are ranked once at ingest into
+# the pincode_topk table, so the dashboard only reads up to TOP_K rows per window.
+
+# Ranks kept per window
+TOP_K = 10
+
+# State_id of the all-India window (pincode totals over every state)
+ALL_INDIA = 0
+
+# Ranked metrics: source table and value column
+METRICS = {
+    "transaction_amount": ("top_transaction", "Transaction_amount"),
+    "transaction_count": ("top_transaction", "Transaction_count"),
+    "insurance_amount": ("top_insurance", "Transaction_amount"),
+    "insurance_count": ("top_insurance", "Transaction_count"),
+    "registered_users": ("top_user", "RegisteredUsers"),
+}
+
+TOPK_TABLE = """
+    CREATE TABLE IF NOT EXISTS pincode_topk(
+        Metric VARCHAR(32) NOT NULL,
+        State_id SMALLINT NOT NULL,
+        Years INT NOT NULL,
+        Quarter INT NOT NULL,
+        Rnk INT NOT NULL,
+        Pincodes INT,
+        Value BIGINT,
+        Prev_rank INT,
+        PRIMARY KEY (Metric, State_id, Years, Quarter, Rnk)
+    );
+    """
+
+
+# Function to build the SELECT ranking the windows of one metric.
+# With years, only those years are returned (the year before is read too, for the
+# previous-quarter ranks). Works on MySQL 8 and DuckDB.
+def topk_sql(metric, years=None):
+    source, column = METRICS[metric]
+    where = ""
+    params = []
+    if years is not None:
+        years = sorted(years)
+        read_years = sorted(set(years) | {year - 1 for year in years})
+        where = f"WHERE Years IN ({', '.join(['%s'] * len(read_years))})"
+        params = read_years + read_years
+    sql = f"""
+        WITH windows AS (
+            SELECT State_id, Years, Quarter, Pincodes, {column} AS Value
+            FROM {source} {where}
+            UNION ALL
+            SELECT {ALL_INDIA}, Years, Quarter, Pincodes, SUM({column})
+            FROM {source} {where}
+            GROUP BY Years, Quarter, Pincodes
+        ),
+        ranked AS (
+            SELECT State_id, Years, Quarter, Pincodes, Value,
+                   ROW_NUMBER() OVER (PARTITION BY State_id, Years, Quarter
+                                      ORDER BY Value DESC, Pincodes) AS Rnk
+            FROM windows
+        )
+        SELECT '{metric}' AS Metric, r.State_id, r.Years, r.Quarter, r.Rnk,
+               r.Pincodes, r.Value, p.Rnk AS Prev_rank
+        FROM ranked r
+        LEFT JOIN ranked p
+            ON p.State_id = r.State_id AND p.Pincodes = r.Pincodes
+            AND p.Years * 4 + p.Quarter = r.Years * 4 + r.Quarter - 1
+        WHERE r.Rnk <= {TOP_K}
+        """
+    if years is not None:
+        sql += f" AND r.Years IN ({', '.join(['%s'] * len(years))})"
+        params += years
+    return sql, params
+
+
+# Function to create the pincode_topk table (safe to run more than once)
+def create_table(connection):
+    with connection.cursor() as cursor:
+        cursor.execute(TOPK_TABLE)
+    connection.commit()
+
+
+# Function to rank the windows of the loaded years again.
+# changes maps a fact table to the years that were loaded (None = everything);
+# the year after a loaded year is refreshed too, its Q1 previous ranks change.
+def refresh(connection, changes):
+    with connection.cursor() as cursor:
+        for metric, (source, _) in METRICS.items():
+            if source not in changes:
+                continue
+            years = changes[source]
+            if years is None:
+                cursor.execute("DELETE FROM pincode_topk WHERE Metric = %s", (metric,))
+            else:
+                years = sorted(set(years) | {year + 1 for year in years})
+                if not years:
+                    continue
+                cursor.execute(
+                    f"DELETE FROM pincode_topk WHERE Metric = %s "
+                    f"AND Years IN ({', '.join(['%s'] * len(years))})",
+                    [metric] + years)
+            sql, params = topk_sql(metric, years)
+            cursor.execute(
+                "INSERT INTO pincode_topk(Metric, State_id, Years, Quarter, Rnk, "
+                "Pincodes, Value, Prev_rank) " + sql,
+                params or None)
+    connection.commit()
+
+
+# Function to rank every window from the fact tables
+def refresh_all(connection):
+    refresh(connection, {source: None for source, _ in METRICS.values()})
@@ -0,0 +1,272 @@
+# Registry of the SQL run by phonepe.py, by name (also used by benchmark.py to
+# time every dashboard query). Values are bound with %s placeholders, never
+# formatted into the text, so every query has one fixed statement: MySQL
+# prepares it once per connection and the query cache keys it by name.
+# State names come from the state_dim table; the rollups only store State_id.
+
+QUERIES = {
+    # Business Case 1
+    "transaction_volume_by_state": """
+        SELECT s.Name AS States,
+               SUM(Transaction_count) AS Total_Count,
+               SUM(Transaction_amount) AS Total_Amount
+        FROM aggregated_transaction_by_state t
+        JOIN state_dim s ON s.State_id = t.State_id
+        GROUP BY s.Name
+        """,
+    "transaction_trend_by_quarter": """
+        SELECT
+            Years,
+            Quarter,
+            SUM(Transaction_count) AS Total_Transaction_Count,
+            SUM(Transaction_amount) AS Total_Transaction_Amount
+        FROM aggregated_transaction_by_state
+        GROUP BY Years, Quarter
+        ORDER BY Years, Quarter;
+        """,
+    "payment_categories_by_state_year": """
+        SELECT s.Name AS States,
+            Transaction_type,
+            Years AS Year,
+            SUM(Transaction_count) AS Total_Count,
+            SUM(Transaction_amount) AS Total_Amount
+        FROM aggregated_transaction_by_state_type t
+        JOIN state_dim s ON s.State_id = t.State_id
+        GROUP BY s.Name, Transaction_type, Year
+        ORDER BY States, Year, Total_Amount DESC;
+        """,
+    "top10_states_by_transaction_amount": """
+        SELECT s.Name AS States,
+               SUM(Transaction_amount) AS Total_Transaction_Amount
+        FROM aggregated_transaction_by_state t
+        JOIN state_dim s ON s.State_id = t.State_id
+        GROUP BY s.Name
+        ORDER BY Total_Transaction_Amount DESC
+        LIMIT 10;
+        """,
+    "transaction_year_quarters": """
+        SELECT DISTINCT Years, Quarter
+        FROM aggregated_transaction_by_state
+        ORDER BY Years, Quarter;
+        """,
+    "map_state_totals": """
+        SELECT s.Geo_name AS state, SUM(t.Transaction_amount) AS Total_Transaction_Value
+        FROM map_transaction_by_state t
+        JOIN state_dim s ON s.State_id = t.State_id
+        WHERE t.Years = %s AND t.Quarter = %s
+        GROUP BY s.Geo_name;
+        """,
+    "district_map_transaction": """
+        SELECT Districts AS district, Transaction_amount AS Value
+        FROM map_transaction
+        WHERE State_id = %s AND Years = %s AND Quarter = %s;
+        """,
+    "district_map_user": """
+        SELECT Districts AS district, RegisteredUsers AS Value
+        FROM map_user
+        WHERE State_id = %s AND Years = %s AND Quarter = %s;
+        """,
+    "district_map_insurance": """
+        SELECT Districts AS district, Transaction_amount AS Value
+        FROM map_insurance
+        WHERE State_id = %s AND Years = %s AND Quarter = %s;
+        """,
+    "map_state_year_quarters": """
+        SELECT DISTINCT s.Name AS States, Years, Quarter
+        FROM map_transaction_by_state t
+        JOIN state_dim s ON s.State_id = t.State_id
+        ORDER BY States, Years, Quarter;
+        """,
+
+    # Business Case 2
+    "top10_districts_by_users": """
+        SELECT Districts, SUM(RegisteredUsers) AS total_users
+        FROM map_user_by_district
+        GROUP BY Districts
+        ORDER BY total_users DESC
+        LIMIT 10;
+        """,
+    "users_vs_app_opens_by_year": """
+        SELECT Years,
+            SUM(RegisteredUsers) AS total_registered_users,
+            SUM(AppOpens) AS total_app_opens
+        FROM map_user_by_state
+        GROUP BY Years
+        ORDER BY Years;
+        """,
+    "registered_users_by_year": """
+        SELECT Years, SUM(RegisteredUsers) AS total_users
+        FROM map_user_by_state
+        GROUP BY Years
+        ORDER BY Years;
+        """,
+    "device_brand_share": """
+        SELECT Brands, SUM(Transaction_count) AS total_users
+        FROM aggregated_user_by_state_brand
+        GROUP BY Brands
+        ORDER BY total_users DESC
+        LIMIT 10;
+        """,
+    "engagement_rate_by_state": """
+        SELECT s.Name AS States,
+            SUM(RegisteredUsers) AS total_registered_users,
+            SUM(AppOpens) AS total_app_opens,
+            (SUM(AppOpens) / SUM(RegisteredUsers)) AS engagement_rate
+        FROM aggregated_user_by_state_brand t
+        JOIN state_dim s ON s.State_id = t.State_id
+        GROUP BY s.Name
+        ORDER BY engagement_rate DESC;
+        """,
+    "device_preference_by_state": """
+        SELECT s.Name AS States,
+            Brands,
+            SUM(RegisteredUsers) AS num_users
+        FROM aggregated_user_by_state_brand t
+        JOIN state_dim s ON s.State_id = t.State_id
+        GROUP BY s.Name, Brands
+        ORDER BY States, num_users DESC;
+        """,
+
+    # Business Case 3
+    "top10_states_by_amount": """
+        SELECT s.Name AS States, SUM(Transaction_amount) AS Total_Amount
+        FROM aggregated_transaction_by_state t
+        JOIN state_dim s ON s.State_id = t.State_id
+        GROUP BY s.Name
+        ORDER BY Total_Amount DESC
+        LIMIT 10;
+        """,
+    "transaction_amount_by_year_state": """
+        SELECT Years, s.Name AS States, SUM(Transaction_amount) AS Total_Amount
+        FROM aggregated_transaction_by_state t
+        JOIN state_dim s ON s.State_id = t.State_id
+        GROUP BY Years, s.Name
+        ORDER BY Years, Total_Amount DESC;
+        """,
+    "transaction_type_by_state": """
+        SELECT s.Name AS States, Transaction_type, SUM(Transaction_amount) AS Total_Amount
+        FROM aggregated_transaction_by_state_type t
+        JOIN state_dim s ON s.State_id = t.State_id
+        GROUP BY s.Name, Transaction_type
+        ORDER BY States, Total_Amount DESC;
+        """,
+    "transaction_amount_by_state_quarter": """
+        SELECT s.Name AS States, Years, Quarter, SUM(Transaction_amount) AS Total_Amount
+        FROM aggregated_transaction_by_state t
+        JOIN state_dim s ON s.State_id = t.State_id
+        GROUP BY s.Name, Years, Quarter;
+        """,
+    "district_amount_by_quarter": """
+        SELECT s.Name AS States, t.Districts, t.Years, t.Quarter,
+               t.Transaction_amount AS Total_Amount
+        FROM map_transaction t
+        JOIN state_dim s ON s.State_id = t.State_id;
+        """,
+    "top_districts_by_amount": """
+        SELECT Districts, SUM(Transaction_amount) AS Total_Amount
+        FROM map_transaction_by_district
+        GROUP BY Districts
+        ORDER BY Total_Amount DESC
+        LIMIT %s;
+        """,
+    "transaction_types_by_amount": """
+        SELECT Transaction_type, SUM(Transaction_amount) AS Total_Amount
+        FROM aggregated_transaction_by_state_type
+        GROUP BY Transaction_type
+        ORDER BY Total_Amount DESC;
+        """,
+
+    # Business Case 4
+    "registered_users_by_state": """
+        SELECT s.Name AS States, SUM(RegisteredUsers) AS Total_Users
+        FROM aggregated_user_by_state_brand t
+        JOIN state_dim s ON s.State_id = t.State_id
+        GROUP BY s.Name
+        ORDER BY Total_Users DESC;
+        """,
+    "registered_users_by_quarter": """
+        SELECT Years, Quarter, SUM(RegisteredUsers) AS Total_Users
+        FROM map_user_by_state_quarter
+        GROUP BY Years, Quarter
+        ORDER BY Years, Quarter;
+        """,
+    "app_opens_by_state": """
+        SELECT s.Name AS States, SUM(AppOpens) AS Total_App_Opens
+        FROM map_user_by_state t
+        JOIN state_dim s ON s.State_id = t.State_id
+        GROUP BY s.Name
+        ORDER BY Total_App_Opens DESC;
+        """,
+    "top10_districts_by_user_count": """
+        SELECT Districts, SUM(RegisteredUsers) AS Total_Users
+        FROM map_user_by_district
+        GROUP BY Districts
+        ORDER BY Total_Users DESC
+        LIMIT 10;
+        """,
+
+    # Pincode Analytics
+    "pincode_windows": """
+        SELECT DISTINCT State_id, Years, Quarter
+        FROM pincode_topk
+        ORDER BY State_id, Years, Quarter;
+        """,
+    "pincode_top_k": """
+        SELECT Rnk, Pincodes, Value, Prev_rank
+        FROM pincode_topk
+        WHERE Metric = %s AND State_id = %s AND Years = %s AND Quarter = %s
+        ORDER BY Rnk;
+        """,
+
+    # Business Case 5
+    "insurance_value_by_state": """
+        SELECT s.Name AS States, SUM(Transaction_amount) AS Total_Insurance_Value
+        FROM aggregated_insurance_by_state t
+        JOIN state_dim s ON s.State_id = t.State_id
+        GROUP BY s.Name
+        ORDER BY Total_Insurance_Value DESC;
+        """,
+    "insurance_value_by_quarter": """
+        SELECT Years, Quarter, SUM(Transaction_amount) AS Total_Insurance_Value
+        FROM aggregated_insurance_by_state
+        GROUP BY Years, Quarter
+        ORDER BY Years, Quarter;
+        """,
+    "top10_states_by_insurance_count": """
+        SELECT s.Name AS States, SUM(Transaction_count) AS Total_Insurance_Count
+        FROM top_insurance_by_state t
+        JOIN state_dim s ON s.State_id = t.State_id
+        GROUP BY s.Name
+        ORDER BY Total_Insurance_Count DESC
+        LIMIT 10;
+        """,
+    "top10_districts_by_insurance": """
+        SELECT Districts, SUM(Transaction_count) AS Insurance_Count
+        FROM map_insurance_by_district
+        GROUP BY Districts
+        ORDER BY Insurance_Count DESC
+        LIMIT 10;
+        """,
+}
+
+# Choices of the "number of top districts" selectbox (case 3, sub-question 4)
+TOP_DISTRICT_CHOICES = [5, 10, 15]
+
+# Parameters of the queries that take some, in placeholder order
+PARAMS = {
+    "map_state_totals": ["Years", "Quarter"],
+    "district_map_transaction": ["State_id", "Years", "Quarter"],
+    "district_map_user": ["State_id", "Years", "Quarter"],
+    "district_map_insurance": ["State_id", "Years", "Quarter"],
+    "top_districts_by_amount": ["Limit"],
+    "pincode_top_k": ["Metric", "State_id", "Years", "Quarter"],
+}
+
+
+# Function to check the parameters of a registry query and return them as a tuple
+def bind(name, params=()):
+    expected = PARAMS.get(name, [])
+    if len(params) != len(expected):
+        raise ValueError(f"query '{name}' takes {len(expected)} parameters "
+                         f"({', '.join(expected) or 'none'}), got {len(params)}")
+    return tuple(params)
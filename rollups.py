@@ -0,0 +1,135 @@
+import schema
+
+
+# Summary tables read by the dashboard instead of the full fact tables.
+# Every rollup keeps Years in its key so it can be refreshed one year at a time.
+ROLLUPS = {
+    "aggregated_transaction_by_state": {
+        "source": "aggregated_transaction",
+        "keys": ["State_id", "Years", "Quarter"],
+        "measures": ["Transaction_count", "Transaction_amount"],
+    },
+    "aggregated_transaction_by_state_type": {
+        "source": "aggregated_transaction",
+        "keys": ["State_id", "Transaction_type", "Years"],
+        "measures": ["Transaction_count", "Transaction_amount"],
+    },
+    "aggregated_insurance_by_state": {
+        "source": "aggregated_insurance",
+        "keys": ["State_id", "Years", "Quarter"],
+        "measures": ["Transaction_count", "Transaction_amount"],
+    },
+    "aggregated_user_by_state_brand": {
+        "source": "aggregated_user",
+        "keys": ["State_id", "Brands", "Years"],
+        "measures": ["Transaction_count", "RegisteredUsers", "AppOpens"],
+    },
+    "map_transaction_by_state": {
+        "source": "map_transaction",
+        "keys": ["State_id", "Years", "Quarter"],
+        "measures": ["Transaction_count", "Transaction_amount"],
+    },
+    "map_transaction_by_district": {
+        "source": "map_transaction",
+        "keys": ["State_id", "Districts", "Years"],
+        "measures": ["Transaction_count", "Transaction_amount"],
+    },
+    "map_insurance_by_district": {
+        "source": "map_insurance",
+        "keys": ["State_id", "Districts", "Years"],
+        "measures": ["Transaction_count", "Transaction_amount"],
+    },
+    "map_user_by_state": {
+        "source": "map_user",
+        "keys": ["State_id", "Years"],
+        "measures": ["RegisteredUsers", "AppOpens"],
+    },
+    "map_user_by_state_quarter": {
+        "source": "map_user",
+        "keys": ["State_id", "Years", "Quarter"],
+        "measures": ["RegisteredUsers", "AppOpens"],
+    },
+    "map_user_by_district": {
+        "source": "map_user",
+        "keys": ["State_id", "Districts", "Years"],
+        "measures": ["RegisteredUsers", "AppOpens"],
+    },
+    "top_insurance_by_state": {
+        "source": "top_insurance",
+        "keys": ["State_id", "Years", "Quarter"],
+        "measures": ["Transaction_count", "Transaction_amount"],
+    },
+}
+
+
+# Function to build the CREATE TABLE statement of a rollup
+def create_rollup_sql(name):
+    rollup = ROLLUPS[name]
+    types = dict(schema.TABLES[rollup["source"]])
+    definitions = [f"{key} {types[key]} NOT NULL" for key in rollup["keys"]]
+    definitions += [f"{measure} BIGINT" for measure in rollup["measures"]]
+    definitions.append(f"PRIMARY KEY ({', '.join(rollup['keys'])})")
+    definitions = ",\n        ".join(definitions)
+    return f"""
+    CREATE TABLE IF NOT EXISTS {name}(
+        {definitions}
+    );
+    """
+
+
+# Function to create every rollup table (safe to run more than once).
+# New rollups are filled right away; rollups from older versions, keyed by the
+# state name, are dropped and rebuilt (schema.create_tables has to run first so
+# the fact tables are upgraded).
+def create_tables(connection):
+    with connection.cursor() as cursor:
+        for name in ROLLUPS:
+            columns = schema.existing_columns(cursor, name)
+            if columns and "State_id" in columns:
+                continue
+            if columns:
+                cursor.execute(f"DROP TABLE {name}")
+            cursor.execute(create_rollup_sql(name))
+            refresh_rollup(cursor, name)
+    connection.commit()
+
+
+# Function to rebuild a rollup, either completely or only for the given years
+def refresh_rollup(cursor, name, years=None):
+    rollup = ROLLUPS[name]
+    keys = ", ".join(rollup["keys"])
+    measures = ", ".join(rollup["measures"])
+    sums = ", ".join(f"SUM({measure})" for measure in rollup["measures"])
+    where = ""
+    params = None
+    if years is not None:
+        years = sorted(years)
+        if not years:
+            return
+        where = f"WHERE Years IN ({', '.join(['%s'] * len(years))})"
+        params = years
+    cursor.execute(f"DELETE FROM {name} {where}", params)
+    cursor.execute(
+        f"""
+        INSERT INTO {name}({keys}, {measures})
+        SELECT {keys}, {sums}
+        FROM {rollup['source']}
+        {where}
+        GROUP BY {keys}
+        """,
+        params)
+
+
+# Function to refresh the rollups after a load.
+# changes maps a fact table to the years that were loaded (None = everything).
+def refresh(connection, changes):
+    with connection.cursor() as cursor:
+        for name, rollup in ROLLUPS.items():
+            if rollup["source"] in changes:
+                refresh_rollup(cursor, name, changes[rollup["source"]])
+    connection.commit()
+
+
+# Function to rebuild every rollup from the fact tables
+def refresh_all(connection):
+    refresh(connection, {table: None for table in schema.TABLES})
@@ -0,0 +1,246 @@
+# Table definitions of the phonepe_data database
+
+import states
+
+# Columns of the nine Pulse tables
+TABLES = {
+    "aggregated_insurance": [
+        ("State_id", "SMALLINT"), ("Years", "INT"), ("Quarter", "INT"),
+        ("Transaction_type", "VARCHAR(128)"),
+        ("Transaction_count", "BIGINT"), ("Transaction_amount", "BIGINT"),
+    ],
+    "aggregated_transaction": [
+        ("State_id", "SMALLINT"), ("Years", "INT"), ("Quarter", "INT"),
+        ("Transaction_type", "VARCHAR(128)"),
+        ("Transaction_count", "BIGINT"), ("Transaction_amount", "BIGINT"),
+    ],
+    "aggregated_user": [
+        ("State_id", "SMALLINT"), ("Years", "INT"), ("Quarter", "INT"),
+        ("Brands", "VARCHAR(128)"), ("Transaction_count", "BIGINT"),
+        ("RegisteredUsers", "BIGINT"), ("AppOpens", "BIGINT"), ("Percentage", "FLOAT"),
+    ],
+    "map_insurance": [
+        ("State_id", "SMALLINT"), ("Years", "INT"), ("Quarter", "INT"),
+        ("Districts", "VARCHAR(128)"),
+        ("Transaction_count", "BIGINT"), ("Transaction_amount", "BIGINT"),
+    ],
+    "map_transaction": [
+        ("State_id", "SMALLINT"), ("Years", "INT"), ("Quarter", "INT"),
+        ("Districts", "VARCHAR(128)"),
+        ("Transaction_count", "BIGINT"), ("Transaction_amount", "BIGINT"),
+    ],
+    "map_user": [
+        ("State_id", "SMALLINT"), ("Years", "INT"), ("Quarter", "INT"),
+        ("Districts", "VARCHAR(128)"),
+        ("RegisteredUsers", "BIGINT"), ("AppOpens", "BIGINT"),
+    ],
+    "top_insurance": [
+        ("State_id", "SMALLINT"), ("Years", "INT"), ("Quarter", "INT"),
+        ("Pincodes", "INT"),
+        ("Transaction_count", "BIGINT"), ("Transaction_amount", "BIGINT"),
+    ],
+    "top_transaction": [
+        ("State_id", "SMALLINT"), ("Years", "INT"), ("Quarter", "INT"),
+        ("Pincodes", "INT"),
+        ("Transaction_count", "BIGINT"), ("Transaction_amount", "BIGINT"),
+    ],
+    "top_user": [
+        ("State_id", "SMALLINT"), ("Years", "INT"), ("Quarter", "INT"),
+        ("Pincodes", "INT"), ("RegisteredUsers", "BIGINT"),
+    ],
+}
+
+# Natural key of every table: one row per (state, year, quarter, dimension)
+KEYS = {
+    "aggregated_insurance": ["State_id", "Years", "Quarter", "Transaction_type"],
+    "aggregated_transaction": ["State_id", "Years", "Quarter", "Transaction_type"],
+    "aggregated_user": ["State_id", "Years", "Quarter", "Brands"],
+    "map_insurance": ["State_id", "Years", "Quarter", "Districts"],
+    "map_transaction": ["State_id", "Years", "Quarter", "Districts"],
+    "map_user": ["State_id", "Years", "Quarter", "Districts"],
+    "top_insurance": ["State_id", "Years", "Quarter", "Pincodes"],
+    "top_transaction": ["State_id", "Years", "Quarter", "Pincodes"],
+    "top_user": ["State_id", "Years", "Quarter", "Pincodes"],
+}
+
+# Secondary indexes matching the dashboard's WHERE and GROUP BY columns
+# (the primary key already covers the GROUP BY State_id queries)
+INDEXES = {
+    "aggregated_insurance": {
+        "idx_years_quarter": ["Years", "Quarter"],
+    },
+    "aggregated_transaction": {
+        "idx_years_quarter": ["Years", "Quarter"],
+        "idx_type": ["Transaction_type", "Transaction_amount"],
+    },
+    "aggregated_user": {
+        "idx_brands": ["Brands"],
+    },
+    "map_insurance": {
+        "idx_years_quarter": ["Years", "Quarter", "State_id"],
+        "idx_districts": ["Districts"],
+    },
+    "map_transaction": {
+        "idx_years_quarter": ["Years", "Quarter", "State_id"],
+        "idx_districts": ["Districts"],
+    },
+    "map_user": {
+        "idx_years_quarter": ["Years", "Quarter", "State_id"],
+        "idx_districts": ["Districts"],
+    },
+    "top_insurance": {
+        "idx_years_quarter": ["Years", "Quarter"],
+    },
+    "top_transaction": {
+        "idx_years_quarter": ["Years", "Quarter"],
+    },
+    "top_user": {
+        "idx_years_quarter": ["Years", "Quarter"],
+    },
+}
+
+# Manifest of the quarter files already loaded by ingest.py
+MANIFEST_TABLE = """
+    CREATE TABLE IF NOT EXISTS ingest_manifest(
+        Dataset VARCHAR(64),
+        Path VARCHAR(512),
+        Size BIGINT,
+        Mtime DOUBLE,
+        Hash CHAR(40),
+        Loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        PRIMARY KEY (Dataset, Path)
+    );
+    """
+
+
+# Version of the loaded data, increased by every load (used to invalidate caches)
+DATA_VERSION_TABLE = """
+    CREATE TABLE IF NOT EXISTS data_version(
+        Id TINYINT PRIMARY KEY,
+        Version BIGINT NOT NULL,
+        Updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    );
+    """
+
+
+# Function to get the column names of a table
+def column_names(table):
+    return [name for name, _ in TABLES[table]]
+
+
+# Function to build the CREATE TABLE statement of a table
+def create_table_sql(table, name=None):
+    keys = KEYS[table]
+    definitions = [
+        f"{column} {sql_type} NOT NULL" if column in keys else f"{column} {sql_type}"
+        for column, sql_type in TABLES[table]
+    ]
+    definitions.append(f"PRIMARY KEY ({', '.join(keys)})")
+    for index, columns in INDEXES[table].items():
+        definitions.append(f"INDEX {index} ({', '.join(columns)})")
+    definitions = ",\n        ".join(definitions)
+    return f"""
+    CREATE TABLE IF NOT EXISTS {name or table}(
+        {definitions}
+    );
+    """
+
+
+# Function to build the INSERT ... ON DUPLICATE KEY UPDATE statement of a table
+# (loading the same quarter twice updates the rows instead of duplicating them)
+def upsert_sql(table):
+    names = column_names(table)
+    updates = ", ".join(f"{name} = VALUES({name})" for name in names if name not in KEYS[table])
+    return f"""
+    INSERT INTO {table}({", ".join(names)})
+    VALUES({", ".join(["%s"] * len(names))})
+    ON DUPLICATE KEY UPDATE {updates}
+    """
+
+
+# Function to check if a table already exists in the database
+def _table_exists(cursor, table):
+    cursor.execute(
+        """
+        SELECT COUNT(*) FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        """,
+        (table,))
+    return cursor.fetchone()[0] > 0
+
+
+# Function to get the index names of an existing table
+def _index_names(cursor, table):
+    cursor.execute(
+        """
+        SELECT DISTINCT INDEX_NAME FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        """,
+        (table,))
+    return {row[0] for row in cursor.fetchall()}
+
+
+# Function to get the column names of an existing table
+def existing_columns(cursor, table):
+    cursor.execute(
+        """
+        SELECT COLUMN_NAME FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        """,
+        (table,))
+    return {row[0] for row in cursor.fetchall()}
+
+
+# Function to upgrade a table created by older versions of the notebook: tables
+# without keys, or storing the state name instead of State_id. The rows are copied
+# into a new table, which also drops the duplicated rows left by re-running the
+# old insert cells.
+def _upgrade_table(cursor, table):
+    indexes = _index_names(cursor, table)
+    has_state_id = "State_id" in existing_columns(cursor, table)
+    if "PRIMARY" not in indexes or not has_state_id:
+        names = column_names(table)
+        if has_state_id:
+            select = ", ".join(f"t.{name}" for name in names)
+            source = f"{table} t"
+        else:
+            select = ", ".join("d.State_id" if name == "State_id" else f"t.{name}" for name in names)
+            source = f"{table} t JOIN state_dim d ON d.Name = t.States"
+        keys = " AND ".join(f"t.{key} IS NOT NULL" for key in KEYS[table] if key != "State_id")
+        cursor.execute(f"DROP TABLE IF EXISTS {table}_upgrade")
+        cursor.execute(create_table_sql(table, f"{table}_upgrade"))
+        cursor.execute(
+            f"INSERT IGNORE INTO {table}_upgrade({', '.join(names)}) "
+            f"SELECT {select} FROM {source} WHERE {keys}")
+        cursor.execute(f"RENAME TABLE {table} TO {table}_old, {table}_upgrade TO {table}")
+        cursor.execute(f"DROP TABLE {table}_old")
+        return
+    for index, columns in INDEXES[table].items():
+        if index not in indexes:
+            cursor.execute(f"ALTER TABLE {table} ADD INDEX {index} ({', '.join(columns)})")
+
+
+# Function to create every table, or upgrade it to the current keys and indexes
+# (safe to run more than once)
+def create_tables(connection):
+    states.create_table(connection)
+    with connection.cursor() as cursor:
+        for table in TABLES:
+            if _table_exists(cursor, table):
+                _upgrade_table(cursor, table)
+            else:
+                cursor.execute(create_table_sql(table))
+        cursor.execute(MANIFEST_TABLE)
+        cursor.execute(DATA_VERSION_TABLE)
+    connection.commit()
+
+
+# Function to record that new data was loaded
+def bump_data_version(connection):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO data_version(Id, Version) VALUES(1, 1)
+            ON DUPLICATE KEY UPDATE Version = Version + 1
+            """)
+    connection.commit()
@@ -0,0 +1,46 @@
+# Per-session store of query results indexed by the columns the widgets filter on
+# (year, state, ...). A result is split into its groups once per data version, so
+# moving a selector is a dict lookup: no query, no copy from the shared cache and
+# no boolean mask over the whole frame.
+
+
+# One grouped result: the options of every index column and a frame per group
+class IndexedResult:
+    def __init__(self, df, by, version):
+        self.by = list(by)
+        self.version = version
+        self._options = {column: list(df[column].unique()) for column in self.by}
+        self._empty = df.iloc[0:0]
+        self._groups = {}
+        for group, frame in df.groupby(self.by, sort=False):
+            self._groups[group if isinstance(group, tuple) else (group,)] = frame
+
+    # Function to get the distinct values of an index column (in result order)
+    def options(self, column):
+        return self._options[column]
+
+    # Function to get the rows of one group, e.g. lookup(2022) or lookup("Goa", 2022)
+    def lookup(self, *values):
+        return self._groups.get(tuple(values), self._empty)
+
+
+# Store kept in the session state (st.session_state, or any dict)
+class ResultStore:
+    def __init__(self, state, key="result_store"):
+        if key not in state:
+            state[key] = {}
+        self._entries = state[key]
+
+    # Function to get a result indexed by the given columns.
+    # load() runs the query (only when the result is missing or the data version
+    # changed); prepare(df), if given, adds derived columns before the split.
+    def get(self, name, by, load, version=None, prepare=None):
+        key = (name, tuple(by))
+        entry = self._entries.get(key)
+        if entry is None or entry.version != version:
+            df = load()
+            if prepare is not None:
+                df = prepare(df)
+            entry = IndexedResult(df, by, version)
+            self._entries[key] = entry
+        return entry
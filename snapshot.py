@@ -0,0 +1,107 @@
+import os
+import json
+import time
+import argparse
+
+import pincodes
+import states
+import storage
+from queries import PARAMS, QUERIES, TOP_DISTRICT_CHOICES, bind
+
+
+# Prefix of the columns holding the parameter values in a snapshot file
+PARAM_PREFIX = "param_"
+
+
+# Function to list every parameter combination the dashboard widgets can produce
+# for a registry query (the slider domains come from the data itself)
+def param_grid(backend, name):
+    params = PARAMS.get(name, [])
+    if not params:
+        return [()]
+    if params == ["Limit"]:
+        return [(top_n,) for top_n in TOP_DISTRICT_CHOICES]
+    if params == ["Years", "Quarter"]:
+        _, rows = backend.read_named("transaction_year_quarters")
+        return [(int(year), int(quarter)) for year, quarter in rows]
+    if params == ["State_id", "Years", "Quarter"]:
+        _, rows = backend.read_named("map_state_year_quarters")
+        return [(states.ID_BY_NAME[state], int(year), int(quarter)) for state, year, quarter in rows]
+    if params == ["Metric", "State_id", "Years", "Quarter"]:
+        _, rows = backend.read_named("pincode_windows")
+        return [(metric, int(state_id), int(year), int(quarter))
+                for metric in pincodes.METRICS for state_id, year, quarter in rows]
+    raise ValueError(f"no parameter grid for query '{name}' ({', '.join(params)})")
+
+
+# Function to run one registry query for every parameter combination and build a
+# single Arrow table: the parameter columns followed by the result columns
+def snapshot_table(backend, name):
+    import pyarrow as pa
+
+    param_names = [PARAM_PREFIX + param for param in PARAMS.get(name, [])]
+    columns = None
+    data = {}
+    for params in param_grid(backend, name):
+        result_columns, rows = backend.read_named(name, bind(name, params))
+        if columns is None:
+            columns = result_columns
+            data = {column: [] for column in param_names + columns}
+        for row in rows:
+            for column, value in zip(param_names, params):
+                data[column].append(value)
+            for column, value in zip(columns, row):
+                data[column].append(value)
+    return pa.table(data)
+
+
+# Function to build the snapshot of every registry query into directory
+# (one Arrow IPC file per query, written next to the old one and swapped in)
+def build(backend, directory=storage.SNAPSHOT_DIR, names=None):
+    import pyarrow as pa
+
+    os.makedirs(directory, exist_ok=True)
+    results = []
+    for name in names or QUERIES:
+        start = time.perf_counter()
+        table = snapshot_table(backend, name)
+        path = storage.snapshot_path(directory, name)
+        with pa.OSFile(path + ".tmp", "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(path + ".tmp", path)
+        results.append({"query": name, "rows": table.num_rows,
+                        "bytes": os.path.getsize(path),
+                        "seconds": round(time.perf_counter() - start, 3)})
+
+    # The manifest is written last: its version changes every build
+    manifest = {"version": time.strftime("%Y%m%dT%H%M%S"),
+                "data_version": backend.data_version(),
+                "queries": {name: PARAMS.get(name, []) for name in names or QUERIES}}
+    with open(os.path.join(directory, "_snapshot.json.tmp"), "w") as f:
+        json.dump(manifest, f, default=str)
+    os.replace(os.path.join(directory, "_snapshot.json.tmp"),
+               os.path.join(directory, "_snapshot.json"))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Precompute every dashboard query into Arrow files for PHONEPE_BACKEND=snapshot")
+    parser.add_argument("--output", default=storage.SNAPSHOT_DIR)
+    parser.add_argument("--backend", choices=["mysql", "parquet"],
+                        default="parquet" if storage.BACKEND == "parquet" else "mysql",
+                        help="backend the queries are run on")
+    parser.add_argument("--parquet-dir", default=storage.PARQUET_DIR)
+    args = parser.parse_args()
+
+    if args.backend == "parquet":
+        source = storage.ParquetBackend(args.parquet_dir)
+    else:
+        source = storage.MySQLBackend()
+    total = 0
+    for result in build(source, args.output):
+        total += result["bytes"]
+        print(f"{result['query']}: {result['rows']} rows, "
+              f"{result['bytes'] // 1024} KB in {result['seconds']}s")
+    print(f"snapshot: {total // 1024} KB in {args.output}")
@@ -0,0 +1,81 @@
+# Canonical state dimension: every Pulse state folder with its display name,
+# its name in the India states GeoJSON (property ST_NM) and a small integer id.
+# The fact tables only store State_id; names come from the state_dim table.
+
+# (State_id, folder slug, display name, GeoJSON name)
+STATES = [
+    (1, "andaman-&-nicobar-islands", "Andaman & Nicobar Islands", "Andaman & Nicobar"),
+    (2, "andhra-pradesh", "Andhra Pradesh", "Andhra Pradesh"),
+    (3, "arunachal-pradesh", "Arunachal Pradesh", "Arunachal Pradesh"),
+    (4, "assam", "Assam", "Assam"),
+    (5, "bihar", "Bihar", "Bihar"),
+    (6, "chandigarh", "Chandigarh", "Chandigarh"),
+    (7, "chhattisgarh", "Chhattisgarh", "Chhattisgarh"),
+    (8, "dadra-&-nagar-haveli-&-daman-&-diu", "Dadra and Nagar Haveli and Daman and Diu",
+     "Dadra and Nagar Haveli and Daman and Diu"),
+    (9, "delhi", "Delhi", "Delhi"),
+    (10, "goa", "Goa", "Goa"),
+    (11, "gujarat", "Gujarat", "Gujarat"),
+    (12, "haryana", "Haryana", "Haryana"),
+    (13, "himachal-pradesh", "Himachal Pradesh", "Himachal Pradesh"),
+    (14, "jammu-&-kashmir", "Jammu & Kashmir", "Jammu & Kashmir"),
+    (15, "jharkhand", "Jharkhand", "Jharkhand"),
+    (16, "karnataka", "Karnataka", "Karnataka"),
+    (17, "kerala", "Kerala", "Kerala"),
+    (18, "ladakh", "Ladakh", "Ladakh"),
+    (19, "lakshadweep", "Lakshadweep", "Lakshadweep"),
+    (20, "madhya-pradesh", "Madhya Pradesh", "Madhya Pradesh"),
+    (21, "maharashtra", "Maharashtra", "Maharashtra"),
+    (22, "manipur", "Manipur", "Manipur"),
+    (23, "meghalaya", "Meghalaya", "Meghalaya"),
+    (24, "mizoram", "Mizoram", "Mizoram"),
+    (25, "nagaland", "Nagaland", "Nagaland"),
+    (26, "odisha", "Odisha", "Odisha"),
+    (27, "puducherry", "Puducherry", "Puducherry"),
+    (28, "punjab", "Punjab", "Punjab"),
+    (29, "rajasthan", "Rajasthan", "Rajasthan"),
+    (30, "sikkim", "Sikkim", "Sikkim"),
+    (31, "tamil-nadu", "Tamil Nadu", "Tamil Nadu"),
+    (32, "telangana", "Telangana", "Telangana"),
+    (33, "tripura", "Tripura", "Tripura"),
+    (34, "uttar-pradesh", "Uttar Pradesh", "Uttar Pradesh"),
+    (35, "uttarakhand", "Uttarakhand", "Uttarakhand"),
+    (36, "west-bengal", "West Bengal", "West Bengal"),
+]
+
+ID_BY_SLUG = {slug: state_id for state_id, slug, _, _ in STATES}
+ID_BY_NAME = {name: state_id for state_id, _, name, _ in STATES}
+NAME_BY_ID = {state_id: name for state_id, _, name, _ in STATES}
+
+# Dimension table joined by the dashboard queries
+STATE_DIM_TABLE = """
+    CREATE TABLE IF NOT EXISTS state_dim(
+        State_id SMALLINT PRIMARY KEY,
+        Slug VARCHAR(64) NOT NULL,
+        Name VARCHAR(64) NOT NULL,
+        Geo_name VARCHAR(64) NOT NULL,
+        UNIQUE KEY uq_name (Name)
+    );
+    """
+
+
+# Function to get the State_id of a Pulse state folder
+def state_id(slug):
+    try:
+        return ID_BY_SLUG[slug]
+    except KeyError:
+        raise ValueError(f"Unknown state folder '{slug}', add it to states.STATES") from None
+
+
+# Function to create and fill the state_dim table (safe to run more than once)
+def create_table(connection):
+    with connection.cursor() as cursor:
+        cursor.execute(STATE_DIM_TABLE)
+        cursor.executemany(
+            """
+            INSERT INTO state_dim(State_id, Slug, Name, Geo_name) VALUES(%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE Slug = VALUES(Slug), Name = VALUES(Name),
+                                    Geo_name = VALUES(Geo_name)
+            """,
+            STATES)
+    connection.commit()
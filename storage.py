@@ -0,0 +1,360 @@
+import os
+import json
+import time
+import shutil
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import pymysql
+
+import db
+import pincodes
+import rollups
+import schema
+import states
+from extractor import DATASET_PATHS, list_files, parse_files, raise_errors
+from queries import PARAMS, QUERIES
+
+
+# Storage backend of the dashboard: "mysql" (default), "parquet" or "snapshot"
+BACKEND = os.environ.get("PHONEPE_BACKEND", "mysql")
+
+# Folder of the Parquet tables (one sub-folder per table, partitioned by Years/Quarter)
+PARQUET_DIR = os.environ.get(
+    "PHONEPE_PARQUET_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "parquet"))
+
+# Folder of the precomputed query results built by snapshot.py
+SNAPSHOT_DIR = os.environ.get(
+    "PHONEPE_SNAPSHOT_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshot"))
+
+
+# Backend reading the MySQL tables through the connection pool
+class MySQLBackend:
+    # Function to run a SELECT and return the column names and rows
+    def read_query(self, query, params=None):
+        return db.read_query(query, params)
+
+    # Function to run a registry query (see queries.py) as a prepared statement
+    def read_named(self, name, params=()):
+        return db.read_prepared(name, QUERIES[name], params)
+
+    # Function to get the version of the loaded data (changes after every ingest)
+    def data_version(self):
+        try:
+            _, rows = db.read_query("SELECT Version FROM data_version WHERE Id = 1")
+        except pymysql.err.ProgrammingError:
+            return None
+        return rows[0][0] if rows else None
+
+
+# Backend answering the same SQL from partitioned Parquet files with DuckDB.
+# Every table is a view over its files, so a query only reads the columns it
+# uses and the Years/Quarter partitions that match its WHERE clause.
+class ParquetBackend:
+    def __init__(self, directory=PARQUET_DIR):
+        import duckdb
+
+        self.directory = directory
+        self._connection = duckdb.connect()
+        self._lock = threading.Lock()
+        self._views = set()
+
+        # The state dimension is small and fixed, so it lives in memory
+        self._connection.execute(
+            "CREATE TABLE state_dim(State_id SMALLINT PRIMARY KEY, Slug VARCHAR, "
+            "Name VARCHAR, Geo_name VARCHAR)")
+        self._connection.executemany("INSERT INTO state_dim VALUES (?, ?, ?, ?)", states.STATES)
+
+    # Function to create the views of the tables written so far
+    def _create_views(self):
+        with self._lock:
+            for table in schema.TABLES:
+                if table in self._views or not os.path.isdir(os.path.join(self.directory, table)):
+                    continue
+                files = os.path.join(self.directory, table, "*", "*", "*.parquet").replace("\\", "/")
+                self._connection.execute(
+                    f"CREATE OR REPLACE VIEW {table} AS "
+                    f"SELECT * FROM read_parquet('{files}', hive_partitioning = true)")
+                self._views.add(table)
+
+            # Rollups are plain aggregate views: the columnar scan is cheap enough
+            for name, rollup in rollups.ROLLUPS.items():
+                if name in self._views or rollup["source"] not in self._views:
+                    continue
+                keys = ", ".join(rollup["keys"])
+                sums = ", ".join(f"SUM({measure}) AS {measure}" for measure in rollup["measures"])
+                self._connection.execute(
+                    f"CREATE OR REPLACE VIEW {name} AS "
+                    f"SELECT {keys}, {sums} FROM {rollup['source']} GROUP BY {keys}")
+                self._views.add(name)
+
+            # Pincode ranks are written at ingest by write_pincode_topk
+            path = os.path.join(self.directory, "pincode_topk.parquet")
+            if "pincode_topk" not in self._views and os.path.exists(path):
+                self._connection.execute(
+                    f"CREATE OR REPLACE VIEW pincode_topk AS "
+                    f"SELECT * FROM read_parquet('{path.replace(chr(92), '/')}')")
+                self._views.add("pincode_topk")
+
+    # Function to run a SELECT and return the column names and rows
+    # (MySQL style %s placeholders are turned into DuckDB ? placeholders)
+    def read_query(self, query, params=None):
+        self._create_views()
+        cursor = self._connection.cursor()
+        try:
+            cursor.execute(query.replace("%s", "?"), list(params) if params is not None else None)
+            rows = cursor.fetchall()
+            columns = [col[0] for col in cursor.description]
+        finally:
+            cursor.close()
+        return columns, rows
+
+    # Function to run a registry query (see queries.py); DuckDB caches the plan itself
+    def read_named(self, name, params=()):
+        return self.read_query(QUERIES[name], params)
+
+    # Function to get the version of the loaded data (written by ingest_parquet)
+    def data_version(self):
+        return read_parquet_manifest(self.directory).get("version")
+
+
+# Function to get the path of the snapshot file of a registry query
+def snapshot_path(directory, name):
+    return os.path.join(directory, f"{name}.arrow")
+
+
+# Backend serving the registry queries from the Arrow files of snapshot.py, without
+# any database. Every file is memory-mapped once; a query only filters the rows of
+# its parameter values.
+class SnapshotBackend:
+    def __init__(self, directory=SNAPSHOT_DIR):
+        self.directory = directory
+        self._tables = {}
+        self._version = None
+        self._lock = threading.Lock()
+
+    # Function to get the memory-mapped table of a query (opened on first use)
+    def _table(self, name):
+        import pyarrow as pa
+
+        with self._lock:
+            if name not in self._tables:
+                path = snapshot_path(self.directory, name)
+                if not os.path.exists(path):
+                    raise FileNotFoundError(f"{path} is missing, run: python snapshot.py")
+                # The table's buffers point into the mapped file, which stays open
+                self._tables[name] = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+            return self._tables[name]
+
+    # Function to answer a registry query from its snapshot
+    def read_named(self, name, params=()):
+        import pyarrow.compute as pc
+        from snapshot import PARAM_PREFIX
+
+        table = self._table(name)
+        param_columns = [PARAM_PREFIX + param for param in PARAMS.get(name, [])]
+        if param_columns:
+            mask = None
+            for column, value in zip(param_columns, params):
+                match = pc.equal(table[column], value)
+                mask = match if mask is None else pc.and_(mask, match)
+            table = table.filter(mask)
+        columns = [column for column in table.column_names if column not in param_columns]
+        return columns, list(zip(*(table[column].to_pylist() for column in columns)))
+
+    # Function to get the version of the snapshot (changes after every build)
+    def data_version(self):
+        path = os.path.join(self.directory, "_snapshot.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as f:
+            version = json.load(f)["version"]
+        with self._lock:
+            if version != self._version:
+                self._tables.clear()
+            self._version = version
+        return version
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+# Function to get the backend selected with PHONEPE_BACKEND (created on first use)
+def get_backend():
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            if BACKEND == "parquet":
+                _backend = ParquetBackend()
+            elif BACKEND == "snapshot":
+                _backend = SnapshotBackend()
+            else:
+                _backend = MySQLBackend()
+        return _backend
+
+
+# Function to read the manifest of the Parquet tables
+# ({"version": n, "files": {dataset: {path: [size, mtime, hash]}}})
+def read_parquet_manifest(directory):
+    path = os.path.join(directory, "_manifest.json")
+    if not os.path.exists(path):
+        return {"version": 0, "files": {}}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+# Function to save the manifest of the Parquet tables (written to a temporary file first)
+def write_parquet_manifest(directory, manifest):
+    path = os.path.join(directory, "_manifest.json")
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f)
+    os.replace(path + ".tmp", path)
+
+
+# Function to write the rows of some Years/Quarter partitions of a table.
+# batches must hold complete partitions: the files of those partitions are replaced.
+def write_partitions(directory, table, batches):
+    import pyarrow.parquet as pq
+
+    rows = 0
+    for batch in batches:
+        if not len(batch):
+            continue
+        pq.write_to_dataset(
+            batch.to_arrow(),
+            os.path.join(directory, table),
+            partition_cols=["Years", "Quarter"],
+            existing_data_behavior="delete_matching",
+            basename_template="part-{i}.parquet")
+        rows += len(batch)
+    return rows
+
+
+# Function to check the batches with the validator, or to stop at the first file
+# that couldn't be read without one
+def _checked(dataset, batches, validator):
+    if validator is None:
+        return raise_errors(batches)
+    return validator.checked(dataset, batches)
+
+
+# Function to read the rows of some states from a Years/Quarter partition written
+# by an earlier run, as {State_id: rows without the State_id, Years, Quarter}
+def read_partition_rows(directory, table, year, quarter, state_ids):
+    import pyarrow.parquet as pq
+
+    path = os.path.join(directory, table, f"Years={year}", f"Quarter={quarter}")
+    if not os.path.isdir(path):
+        return {}
+    data = pq.read_table(path, filters=[("State_id", "in", sorted(state_ids))])
+    columns = [column.to_pylist() for column in data.columns]
+    index = data.column_names.index("State_id")
+    rows = {}
+    for row in zip(*columns):
+        rows.setdefault(row[index], []).append(row[:index] + row[index + 1:])
+    return rows
+
+
+# Function to add back the rows of the slices that were left out of a partition
+# (quarantined files and files that couldn't be read): the partition is rewritten
+# as a whole, so their rows from the earlier run are kept until a run loads them.
+# groups are the files of each partition, in the order of the batches.
+def _keep_previous_rows(directory, dataset, groups, batches):
+    for files, batch in zip(groups, batches):
+        loaded = {source for source, _ in batch.sources}
+        kept = {state for state, _, _, path in files if path in loaded}
+        left_out = {state for state, _, _, path in files if path not in loaded} - kept
+        if left_out:
+            _, year, quarter, _ = files[0]
+            previous = read_partition_rows(directory, dataset, year, quarter, left_out)
+            for state_id, rows in sorted(previous.items()):
+                batch.extend((state_id, year, quarter), rows)
+        yield batch
+
+
+# Function to rank the pincode windows of the Parquet tables into pincode_topk.parquet
+# (the whole file is rebuilt: it only holds TOP_K rows per window)
+def write_pincode_topk(directory):
+    backend = ParquetBackend(directory)
+    backend._create_views()
+    selects = [pincodes.topk_sql(metric)[0] for metric, (source, _) in pincodes.METRICS.items()
+               if source in backend._views]
+    if not selects:
+        return
+    path = os.path.join(directory, "pincode_topk.parquet")
+    union = " UNION ALL ".join(f"SELECT * FROM ({select})" for select in selects)
+    backend._connection.execute(
+        f"COPY ({union}) TO '{(path + '.tmp').replace(chr(92), '/')}' (FORMAT PARQUET)")
+    os.replace(path + ".tmp", path)
+
+
+# Function to load the Pulse data into Parquet, only rewriting the Years/Quarter
+# partitions that contain a new or changed file (all states of such a partition
+# are parsed again, one partition per worker process).
+def ingest_parquet(root, directory=PARQUET_DIR, datasets=None, workers=None, full=False,
+                   validator=None):
+    from ingest import find_changed_files
+
+    os.makedirs(directory, exist_ok=True)
+    manifest = read_parquet_manifest(directory)
+    results = []
+    for dataset in datasets or DATASET_PATHS:
+        start = time.perf_counter()
+        if full:
+            shutil.rmtree(os.path.join(directory, dataset), ignore_errors=True)
+        known = {} if full else {path: tuple(values) for path, values
+                                 in manifest["files"].get(dataset, {}).items()}
+        changed, manifest_rows = find_changed_files(root, dataset, known)
+
+        partitions = {(year, quarter) for _, year, quarter, _ in changed}
+        groups = {}
+        for file in list_files(root, dataset):
+            if (file[1], file[2]) in partitions:
+                groups.setdefault((file[1], file[2]), []).append(file)
+
+        groups = list(groups.values())
+        if validator is not None:
+            validator.check_grid(root, dataset)
+        if len(groups) <= 1 or workers == 1:
+            batches = map(parse_files, repeat(dataset), groups)
+            batches = _keep_previous_rows(directory, dataset, groups,
+                                          _checked(dataset, batches, validator))
+            rows = write_partitions(directory, dataset, batches)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                batches = pool.map(parse_files, repeat(dataset), groups)
+                batches = _keep_previous_rows(directory, dataset, groups,
+                                              _checked(dataset, batches, validator))
+                rows = write_partitions(directory, dataset, batches)
+
+        # Quarantined files stay out of the manifest: the next run reads them again
+        # (until then their partition keeps their rows from the earlier run)
+        quarantined = set()
+        if validator is not None:
+            from validate import relative_paths
+            quarantined = relative_paths(root, validator.quarantined)
+        files = {} if full else manifest["files"].get(dataset, {})
+        for _, path, size, mtime, content_hash in manifest_rows:
+            if path in quarantined:
+                files.pop(path, None)
+            else:
+                files[path] = [size, mtime, content_hash]
+        manifest["files"][dataset] = files
+        results.append({
+            "dataset": dataset,
+            "files": len(changed),
+            "rows": rows,
+            "seconds": round(time.perf_counter() - start, 3),
+        })
+
+    if validator is not None:
+        validator.check_cross_tables()
+    if any(result["files"] for result in results):
+        write_pincode_topk(directory)
+        manifest["version"] = manifest.get("version", 0) + 1
+    write_parquet_manifest(directory, manifest)
+    return results
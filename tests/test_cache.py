@@ -0,0 +1,32 @@
+# Query cache: results read under an older data version are never served
+import pandas as pd
+
+from cache import QueryCache
+
+
+def test_result_of_an_older_version_is_not_cached():
+    cache = QueryCache(version_check_seconds=0)
+    versions = iter([1, 2, 2, 2])
+
+    # The ingest bumps the version while the first query runs
+    def run(sql, params):
+        cache._check_version(lambda: next(versions))
+        return pd.DataFrame({"Value": [1]})
+
+    cache.get_or_run("SELECT 1", None, run, lambda: next(versions))
+    cache.get_or_run("SELECT 1", None, run, lambda: next(versions))
+
+    assert cache.hits == 0
+    assert cache.misses == 2
+
+
+def test_result_is_served_until_the_version_changes():
+    cache = QueryCache(version_check_seconds=0)
+    version = [1]
+    run = lambda sql, params: pd.DataFrame({"Value": [version[0]]})
+
+    assert cache.get_or_run("SELECT 1", None, run, lambda: version[0])["Value"][0] == 1
+    assert cache.get_or_run("SELECT 1", None, run, lambda: version[0])["Value"][0] == 1
+    version[0] = 2
+    assert cache.get_or_run("SELECT 1", None, run, lambda: version[0])["Value"][0] == 2
+    assert cache.hits == 1
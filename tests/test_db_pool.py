@@ -0,0 +1,88 @@
+# Connection pool of the dashboard: slots always go back to the pool, and
+# connections that can't roll back or are closed are thrown away
+import pymysql
+import pytest
+
+import db
+
+
+# Connection whose socket can be closed under it
+class FakeConnection:
+    def __init__(self, closed=False):
+        self.socket_closed = closed
+        self.closed = False
+
+    def rollback(self):
+        if self.socket_closed:
+            raise pymysql.err.InterfaceError(0, "")
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    opened = []
+
+    def get_connection(**settings):
+        opened.append(FakeConnection(closed=True))
+        return opened[-1]
+
+    monkeypatch.setattr(db, "get_connection", get_connection)
+    return opened
+
+
+def test_failed_rollback_releases_the_slot(connections):
+    pool = db.ConnectionPool(max_size=2, timeout=0.1)
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            with pool.connection():
+                raise ValueError("query failed")
+
+    assert len(connections) == 3
+    assert all(connection.closed for connection in connections)
+    assert pool._idle.empty()
+
+
+def test_interface_error_closes_the_connection(connections):
+    pool = db.ConnectionPool(max_size=1, timeout=0.1)
+    with pytest.raises(pymysql.err.InterfaceError):
+        with pool.connection():
+            raise pymysql.err.InterfaceError(0, "")
+
+    with pool.connection() as connection:
+        assert connection is connections[1]
+    assert connections[0].closed
+
+
+def test_read_query_retries_interface_error(monkeypatch):
+    pool = db.ConnectionPool(max_size=1, timeout=0.1)
+    monkeypatch.setattr(db, "get_pool", lambda: pool)
+    calls = []
+
+    class Cursor:
+        description = [("Years",)]
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def execute(self, query, params=None):
+            calls.append(query)
+            if len(calls) == 1:
+                raise pymysql.err.InterfaceError(0, "")
+
+        def fetchall(self):
+            return [(2023,)]
+
+    class Connection(FakeConnection):
+        def cursor(self):
+            return Cursor()
+
+        def commit(self):
+            pass
+
+    monkeypatch.setattr(db, "get_connection", lambda **settings: Connection())
+    assert db.read_query("SELECT Years FROM t") == (["Years"], [(2023,)])
@@ -0,0 +1,114 @@
+# Incremental decoder: iter_entries must give the entries json.load finds, whatever
+# the chunk boundaries, and fail on truncated documents
+import io
+import json
+
+import pytest
+
+import decoder
+import extractor
+from extractor import ENTRIES
+
+# One entry of every ENTRIES kind, with escapes, unicode and every number form
+ENTRY = {
+    "aggregated_transaction": {"name": "Recharge & \"bill\" payments", "paymentInstruments": [
+        {"type": "TOTAL", "count": 4200, "amount": 1.25e7}]},
+    "map_transaction": {"name": "north goa district", "metric": [
+        {"type": "TOTAL", "count": 0, "amount": -0.0}]},
+    "map_user": ("ನಗರ \\ district", {"registeredUsers": 12, "appOpens": 0}),
+    "top_transaction": {"entityName": "403001", "metric": {"type": "TOTAL", "count": 7,
+                                                           "amount": 123.456789}},
+    "top_user": {"name": "403002", "registeredUsers": 99},
+}
+ENTRY["aggregated_insurance"] = ENTRY["aggregated_transaction"]
+ENTRY["map_insurance"] = ENTRY["map_transaction"]
+ENTRY["top_insurance"] = ENTRY["top_transaction"]
+
+# Values around the wanted entries that must be skipped
+NOISE = {"success": True, "code": "SUCCESS", "responseTimestamp": 1630346628866,
+         "ratio": -1.5e-3, "none": None, "nested": [{"a": "]}\\\"[{", "b": [[], {}]}, "x"]}
+
+
+# Function to build a Pulse-like document with the entries of a kind at its keys
+def document(dataset, entries):
+    keys, _ = ENTRIES[dataset]
+    if dataset == "map_user":
+        entries = dict(entries)
+    data = {"from": NOISE, **{keys[-1]: entries}, "to": NOISE}
+    return json.dumps({"success": True, keys[0]: data, "responseTimestamp": 1}, ensure_ascii=False)
+
+
+# Function to get the entries found by json.load (the reference)
+def reference(text, keys):
+    data = json.loads(text)
+    for key in keys:
+        data = data.get(key) if isinstance(data, dict) else None
+    if isinstance(data, dict):
+        return list(data.items())
+    return list(data) if isinstance(data, list) else []
+
+
+# Function to read the entries incrementally, chunk_size characters at a time
+def entries(text, keys, chunk_size):
+    return list(decoder._entries(decoder._Stream(io.StringIO(text), chunk_size), list(keys)))
+
+
+@pytest.mark.parametrize("dataset", sorted(ENTRIES))
+def test_entries_match_json_load_at_every_chunk_size(dataset):
+    keys, _ = ENTRIES[dataset]
+    text = document(dataset, [ENTRY[dataset]] * 3)
+    expected = reference(text, keys)
+    assert len(expected) == 1 if dataset == "map_user" else len(expected) == 3
+    for chunk_size in range(1, 40):
+        assert entries(text, keys, chunk_size) == expected
+
+
+@pytest.mark.parametrize("dataset", sorted(ENTRIES))
+def test_parse_file_streamed_matches_decoded(dataset, tmp_path, monkeypatch):
+    path = tmp_path / "1.json"
+    path.write_text(document(dataset, [ENTRY[dataset]] * 2), encoding="utf-8")
+    decoded = extractor.parse_file(dataset, str(path))
+    monkeypatch.setattr(decoder, "STREAM_BYTES", 0)
+    assert extractor.parse_file(dataset, str(path)) == decoded
+
+
+@pytest.mark.parametrize("text", [
+    '{"data": {"pincodes": null}}',
+    '{"data": {"districts": [1, 2]}}',
+    '{"data": null}',
+    '{}',
+    '{"data": {"pincodes": []}}',
+    '{"data": {"pincodes": {}}}',
+    '{"data": {"pincodes": "not a list"}}',
+    '{"data": {"pincodes": [ ] , "pincodes2": [1]}}',
+    '[{"data": {"pincodes": [1]}}]',
+    ' {"data" : {"pincodes" : [true, false, null, -0, 1e-7, "\\u00e9"] } } ',
+])
+def test_null_missing_and_empty_entries(text):
+    keys = ("data", "pincodes")
+    for chunk_size in (1, 2, 3, 5, 64):
+        assert entries(text, keys, chunk_size) == reference(text, keys)
+
+
+def test_truncated_document_raises():
+    text = document("top_transaction", [ENTRY["top_transaction"]] * 2)
+    for end in range(len(text)):
+        with pytest.raises(ValueError):
+            entries(text[:end], ENTRIES["top_transaction"][0], 7)
+
+
+def test_large_skipped_value_is_not_decoded(monkeypatch):
+    # A skipped value spanning many chunks, with escapes across chunk boundaries
+    skipped = {"blob": "\\\"]" * 50000, "list": [[i, str(i)] for i in range(20000)]}
+    text = json.dumps({"data": {"other": skipped, "pincodes": [1, 2]}})
+    calls = []
+    raw_decode = json.JSONDecoder.raw_decode
+
+    def counted(self, s, idx=0):
+        calls.append(idx)
+        return raw_decode(self, s, idx)
+
+    monkeypatch.setattr(json.JSONDecoder, "raw_decode", counted)
+    assert entries(text, ("data", "pincodes"), 1000) == [1, 2]
+    # Only the keys and the two entries are decoded, not the 600 chunks of "other"
+    assert len(calls) < 20
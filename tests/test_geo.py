@@ -0,0 +1,52 @@
+# Boundary simplification: borders shared by neighbouring shapes stay identical
+import math
+
+import pytest
+
+import geo
+
+
+# Function to get the points of a wavy vertical edge at x, from bottom to top
+def edge(x, steps=200):
+    return [[x + 0.1 * math.sin(i / 10), i / steps] for i in range(steps + 1)]
+
+
+# Function to build a square-ish feature between two wavy edges
+def shape(left, right, name):
+    ring = right + left[::-1] + [right[0]]
+    return {"type": "Feature", "properties": {"name": name},
+            "geometry": {"type": "Polygon", "coordinates": [ring]}}
+
+
+# Function to get the points of a feature's exterior ring that are on a border
+def on_border(feature, border):
+    points = {tuple(point) for point in feature["geometry"]["coordinates"][0]}
+    return points & {(round(x, 4), round(y, 4)) for x, y in border}
+
+
+def test_shared_borders_stay_identical():
+    shared = edge(1)
+    geojson = {"type": "FeatureCollection",
+               "features": [shape(edge(0), shared, "a"), shape(shared, edge(2), "b")]}
+    a, b = geo.simplify_geojson(geojson, 0.02)["features"]
+
+    assert on_border(a, shared) == on_border(b, shared)
+    assert 2 < len(on_border(a, shared)) < len(shared)
+
+
+def test_junctions_are_the_ends_of_shared_borders():
+    shared = edge(1)
+    geojson = {"type": "FeatureCollection",
+               "features": [shape(edge(0), shared, "a"), shape(shared, edge(2), "b")]}
+    assert geo.find_junctions(geojson) == {tuple(shared[0]), tuple(shared[-1])}
+
+
+def test_district_name_properties_are_found_in_the_file():
+    geojson = {"type": "FeatureCollection", "features": [
+        {"type": "Feature", "properties": {"NAME_1": "Goa", "NAME_2": "North Goa", "ID": 1},
+         "geometry": None}]}
+    assert geo.find_property(geojson, geo.STATE_PROPERTIES) == "NAME_1"
+    assert geo.find_property(geojson, geo.DISTRICT_PROPERTIES) == "NAME_2"
+    assert geo.find_property(geojson, geo.STATE_PROPERTIES, "ID") == "ID"
+    with pytest.raises(ValueError, match="found: \\['ID', 'NAME_1', 'NAME_2'\\]"):
+        geo.find_property(geojson, ["st_nm"])
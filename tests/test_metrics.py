@@ -0,0 +1,26 @@
+# Page timings: figure builds are recorded next to the queries of their page and
+# left out of the render time
+import time
+
+import metrics
+
+
+def test_figure_builds_are_recorded_per_page(monkeypatch):
+    recorder = metrics.Recorder(path=None)
+    monkeypatch.setattr(metrics, "RECORDER", recorder)
+
+    metrics.start_page()
+    metrics.record_query("SELECT 1", 1, 0.01, 0.001, 0.011, cached=False, name="q")
+    metrics.record_figure(("q", "bar"), 0.05)
+    metrics.record_figure(("q", "line"), 0.0, cached=True)
+    time.sleep(0.07)
+    metrics.end_page("case / sub-question")
+
+    events = {event["kind"]: event for event in recorder.events}
+    page = events["page"]
+    assert page["figure_ms"] == 50.0
+    assert abs(page["total_ms"] - page["data_ms"] - page["import_ms"] - 50.0 - page["render_ms"]) < 0.01
+    summary = recorder.figure_summary()
+    assert set(summary["figure"]) == {"('q', 'bar')", "('q', 'line')"}
+    assert set(summary["page"]) == {"case / sub-question"}
+    assert summary["cache_hits"].sum() == 1
@@ -0,0 +1,179 @@
+# Quarantine path of the ingest on both backends: a file left out of a run keeps
+# the rows loaded for its slice by the earlier run
+import json
+
+import pytest
+
+import benchmark
+import ingest
+import pincodes
+import rollups
+import schema
+import storage
+import validate
+from extractor import list_files, new_batch
+
+DATASET = "map_transaction"
+
+
+# In-memory stand-in for the pymysql connection, answering the statements of
+# ingest.ingest_dataset (the rows of the dataset table and of ingest_manifest)
+class FakeConnection:
+    def __init__(self):
+        self.rows = []
+        self.manifest = {}
+        self.deletes = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.result = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        sql = " ".join(sql.split())
+        connection = self.connection
+        if sql.startswith("SELECT Path"):
+            self.result = [(path, *values) for (dataset, path), values
+                           in connection.manifest.items() if dataset == params[0]]
+        elif sql.startswith("DELETE FROM ingest_manifest"):
+            connection.manifest.clear()
+        elif sql.startswith(f"DELETE FROM {DATASET} WHERE"):
+            connection.deletes.append(tuple(params))
+            connection.rows = [row for row in connection.rows if row[:3] != tuple(params)]
+        elif sql.startswith(f"DELETE FROM {DATASET}"):
+            connection.rows = []
+        elif sql.startswith("INSERT INTO ingest_manifest"):
+            connection.manifest[params[:2]] = params[2:]
+        elif sql.startswith(f"INSERT INTO {DATASET}"):
+            connection.rows.append(tuple(params))
+        else:
+            raise AssertionError(f"unexpected statement: {sql}")
+
+    def executemany(self, sql, rows):
+        for params in rows:
+            self.execute(sql, params)
+
+    def fetchall(self):
+        return self.result
+
+
+@pytest.fixture
+def root(tmp_path):
+    root = str(tmp_path / "data")
+    benchmark.generate(root, states=3, years=1, districts=3, pincodes=2)
+    return root
+
+
+@pytest.fixture
+def no_refresh(monkeypatch):
+    for module, name in ((rollups, "refresh"), (pincodes, "refresh"), (schema, "bump_data_version")):
+        monkeypatch.setattr(module, name, lambda *args: None)
+
+
+# Function to get the files of the dataset for one quarter
+def quarter_files(root, quarter):
+    return [path for _, _, file_quarter, path in list_files(root, DATASET) if file_quarter == quarter]
+
+
+# Function to give a file a negative transaction count (a range error)
+def corrupt(path):
+    with open(path, "r") as f:
+        data = json.load(f)
+    data["data"]["hoverDataList"][0]["metric"][0]["count"] = -5
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+# Function to make a file unreadable
+def break_json(path):
+    with open(path, "w") as f:
+        f.write("{broken")
+
+
+# Function to get the sorted rows of the Parquet table
+def parquet_rows(directory):
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(f"{directory}/{DATASET}").to_pydict()
+    columns = schema.column_names(DATASET)
+    return sorted(zip(*[[str(value) for value in table[column]] for column in columns]))
+
+
+def test_mysql_quarantine_keeps_previous_rows(root, no_refresh):
+    connection = FakeConnection()
+    ingest.ingest_dataset(connection, root, DATASET, workers=1, validator=validate.Validator())
+    before = sorted(connection.rows)
+
+    bad, broken = quarter_files(root, 1)[:2]
+    corrupt(bad)
+    break_json(broken)
+    validator = validate.Validator(quarantine=True)
+    result = ingest.ingest_dataset(connection, root, DATASET, workers=1, validator=validator)
+
+    assert result["files"] == 2
+    assert sorted(connection.rows) == before
+    assert validator.quarantined == {bad, broken}
+    changed, _ = ingest.find_changed_files(root, DATASET, ingest.read_manifest(connection.cursor(), DATASET))
+    assert {path for *_, path in changed} == {bad, broken}
+
+
+def test_mysql_replace_slices_deletes_each_slice_once(root):
+    connection = FakeConnection()
+    connection.rows = [(1, 2018, 1, "old", 1, 1.0)]
+    files = quarter_files(root, 1)
+    slices = {path: (1, 2018, 1) for path in files}
+    batches = []
+    for path in files:
+        batch = new_batch(DATASET)
+        batch.extend((1, 2018, 1), [(path, 1, 1.0)], source=path)
+        batches.append(batch)
+
+    for batch in ingest.replace_slices(connection, DATASET, batches, slices):
+        connection.rows.extend(zip(*[batch[name] for name in batch.columns]))
+
+    assert connection.deletes == [(1, 2018, 1)]
+    assert sorted(row[3] for row in connection.rows) == sorted(files)
+
+
+def test_parquet_quarantine_keeps_previous_rows(root, tmp_path):
+    directory = str(tmp_path / "parquet")
+    storage.ingest_parquet(root, directory, [DATASET], workers=1, validator=validate.Validator())
+    before = parquet_rows(directory)
+
+    bad, broken = quarter_files(root, 1)[:2]
+    corrupt(bad)
+    break_json(broken)
+    validator = validate.Validator(quarantine=True)
+    storage.ingest_parquet(root, directory, [DATASET], workers=1, validator=validator)
+
+    assert parquet_rows(directory) == before
+    assert validator.quarantined == {bad, broken}
+    manifest = storage.read_parquet_manifest(directory)["files"][DATASET]
+    changed, _ = ingest.find_changed_files(root, DATASET, {path: tuple(values) for path, values
+                                                           in manifest.items()})
+    assert {path for *_, path in changed} == {bad, broken}
+
+
+def test_parquet_unreadable_file_keeps_previous_rows(root, tmp_path):
+    directory = str(tmp_path / "parquet")
+    storage.ingest_parquet(root, directory, [DATASET], workers=1, validator=validate.Validator())
+    before = parquet_rows(directory)
+
+    # Unreadable files are left out even when only reporting
+    break_json(quarter_files(root, 2)[0])
+    storage.ingest_parquet(root, directory, [DATASET], workers=1, validator=validate.Validator())
+
+    assert parquet_rows(directory) == before
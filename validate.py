@@ -0,0 +1,254 @@
+# Data quality checks of the ingest. Every batch from the extractor is checked
+# with NumPy over its column buffers (no loop over the rows): files that couldn't
+# be read, missing dimension values, values out of range, duplicate keys and files
+# without rows. After a dataset, the file listing is checked for duplicate and
+# missing (state, year, quarter) slices; after the run, the slice totals of related
+# tables are compared (map vs aggregated, top pincodes vs state totals).
+# Issues are collected in a report. Files that can't be read or have missing
+# dimension values are always left out of the load and of the manifest, so the
+# next run reads them again; with quarantine, so are the files with any other error.
+import os
+import time
+import datetime
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+import schema
+import states
+from extractor import COLUMNS, list_files
+
+
+# First year of the Pulse data
+FIRST_YEAR = 2018
+
+# Allowed range of the numeric columns (None = unbounded)
+RANGES = {
+    "Years": (FIRST_YEAR, datetime.date.today().year),
+    "Quarter": (1, 4),
+    "Transaction_count": (0, None),
+    "Transaction_amount": (0, None),
+    "RegisteredUsers": (0, None),
+    "AppOpens": (0, None),
+    "Percentage": (0, 1),
+}
+
+# Slice totals compared across tables: (dataset, column, reference dataset,
+# reference column, relation). "equal" allows a relative difference of TOLERANCE,
+# "at_most" checks that the top pincodes don't exceed the state total.
+CROSS_CHECKS = [
+    ("map_transaction", "Transaction_count", "aggregated_transaction", "Transaction_count", "equal"),
+    ("map_transaction", "Transaction_amount", "aggregated_transaction", "Transaction_amount", "equal"),
+    ("map_insurance", "Transaction_count", "aggregated_insurance", "Transaction_count", "equal"),
+    ("map_insurance", "Transaction_amount", "aggregated_insurance", "Transaction_amount", "equal"),
+    ("map_user", "RegisteredUsers", "aggregated_user", "RegisteredUsers", "equal"),
+    ("top_transaction", "Transaction_amount", "aggregated_transaction", "Transaction_amount", "at_most"),
+    ("top_insurance", "Transaction_amount", "aggregated_insurance", "Transaction_amount", "at_most"),
+    ("top_user", "RegisteredUsers", "map_user", "RegisteredUsers", "at_most"),
+]
+TOLERANCE = 0.01
+
+# aggregated_user repeats the state's registered users on every device row
+SLICE_TOTALS = {("aggregated_user", "RegisteredUsers"): "max"}
+
+SLICE = ["State_id", "Years", "Quarter"]
+
+# Columns of the report, one row per issue
+REPORT_COLUMNS = ["dataset", "check", "severity", "file", "slice", "rows", "detail"]
+
+
+# Pulse folder name of every State_id
+SLUG_BY_ID = {state_id: slug for state_id, slug, _, _ in states.STATES}
+
+
+# Function to name a slice for the report, e.g. "bihar/2021/Q3"
+def slice_name(state_id, year, quarter):
+    return f"{SLUG_BY_ID.get(state_id, state_id)}/{year}/Q{quarter}"
+
+
+# Collects the issues of one ingest run
+class Validator:
+    def __init__(self, quarantine=False):
+        self.quarantine = quarantine
+        self.issues = []
+        self.quarantined = set()
+        self.seconds = 0.0
+        self._totals = {}
+
+    # Function to add one issue to the report
+    def add(self, dataset, check, severity, detail, file=None, slice=None, rows=None):
+        self.issues.append({"dataset": dataset, "check": check, "severity": severity,
+                            "file": file, "slice": slice, "rows": rows, "detail": detail})
+
+    # Function to check a stream of batches, yielding each batch once checked
+    # (without the rows of the quarantined files)
+    def checked(self, dataset, batches):
+        for batch in batches:
+            yield self.check_batch(dataset, batch)
+
+    # Function to check one batch
+    def check_batch(self, dataset, batch):
+        start = time.perf_counter()
+        bad_files = set()
+
+        # Schema: files that couldn't be parsed into the typed columns (they have no rows)
+        for path, message in batch.errors:
+            self.add(dataset, "schema", "error", message, file=path)
+            self.quarantined.add(path)
+        batch.errors = []
+
+        sources = [source for source, _ in batch.sources]
+        counts = np.array([rows for _, rows in batch.sources], dtype=np.int64)
+        source_index = np.repeat(np.arange(len(sources)), counts)
+
+        # Files without rows (e.g. aggregated/user files without usersByDevice)
+        for source, rows in batch.sources:
+            if not rows:
+                self.add(dataset, "empty", "warning", "file has no rows", file=source, rows=0)
+
+        # Schema: missing dimension values (code -1); the tables don't allow them,
+        # so these files are left out like the unreadable ones
+        bad_rows = np.zeros(len(batch), dtype=bool)
+        for column in batch.codes:
+            bad = batch.numpy(column) < 0
+            if bad.any():
+                self._add_rows(dataset, "schema", sources, source_index, bad, f"{column} is null")
+                bad_files.update(sources[i] for i in np.unique(source_index[bad]))
+                bad_rows |= bad
+
+        # Ranges: NaN, infinite and out-of-range values
+        for column in COLUMNS[dataset]:
+            if column not in RANGES:
+                continue
+            values = batch.numpy(column)
+            low, high = RANGES[column]
+            bad = ~np.isfinite(values) if values.dtype.kind == "f" else np.zeros(len(values), dtype=bool)
+            if low is not None:
+                bad |= values < low
+            if high is not None:
+                bad |= values > high
+            if bad.any():
+                self._add_rows(dataset, "range", sources, source_index, bad,
+                               f"{column} outside [{low}, {high if high is not None else ''}]")
+                bad_rows |= bad
+
+        # Keys: duplicate primary keys within the batch (equal neighbours once sorted)
+        keys = schema.KEYS[dataset]
+        columns = [batch.numpy(column) for column in keys]
+        order = np.lexsort(columns[::-1])
+        same = np.ones(max(len(order) - 1, 0), dtype=bool)
+        for values in columns:
+            values = values[order]
+            same &= values[1:] == values[:-1]
+        duplicated = np.zeros(len(order), dtype=bool)
+        duplicated[order[1:][same]] = True
+        duplicated[order[:-1][same]] = True
+        if duplicated.any():
+            self._add_rows(dataset, "duplicate_key", sources, source_index, duplicated,
+                           f"duplicate ({', '.join(keys)})")
+            bad_rows |= duplicated
+
+        if self.quarantine:
+            bad_files.update(sources[i] for i in np.unique(source_index[bad_rows]))
+        if bad_files:
+            self.quarantined.update(bad_files)
+            keep = ~np.isin(source_index, [i for i, source in enumerate(sources) if source in bad_files])
+            batch = batch.take(keep)
+
+        self._add_totals(dataset, batch)
+        self.seconds += time.perf_counter() - start
+        return batch
+
+    # Function to report the rows flagged by a check, one issue per file
+    def _add_rows(self, dataset, check, sources, source_index, bad, detail):
+        files, rows = np.unique(source_index[bad], return_counts=True)
+        for i, count in zip(files, rows):
+            self.add(dataset, check, "error", detail, file=sources[i], rows=int(count))
+
+    # Function to keep the slice totals of the columns compared by CROSS_CHECKS.
+    # Every file is one slice, so the totals are reduced over the file boundaries.
+    def _add_totals(self, dataset, batch):
+        columns = {column for left, column, _, _, _ in CROSS_CHECKS if left == dataset}
+        columns |= {column for _, _, right, column, _ in CROSS_CHECKS if right == dataset}
+        counts = np.array([rows for _, rows in batch.sources if rows], dtype=np.int64)
+        if not columns or not len(counts):
+            return
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        totals = {column: batch.numpy(column)[starts] for column in SLICE}
+        for column in columns:
+            reduce = np.maximum if SLICE_TOTALS.get((dataset, column)) == "max" else np.add
+            totals[column] = reduce.reduceat(batch.numpy(column), starts)
+        self._totals.setdefault(dataset, []).append(totals)
+
+    # Function to get the slice totals of a dataset's column as a Series by slice
+    def _slice_totals(self, dataset, column):
+        frame = pd.DataFrame({name: np.concatenate([totals[name] for totals in self._totals[dataset]])
+                              for name in SLICE + [column]})
+        return frame.groupby(SLICE)[column].sum()
+
+    # Function to check the files of a dataset on disk: two files for the same
+    # slice (e.g. 1.json and 01.json), and quarters missing from the grid of the
+    # states present × every quarter from the first to the last one found
+    def check_grid(self, root, dataset):
+        files = list(list_files(root, dataset))
+        slices = Counter((state, year, quarter) for state, year, quarter, _ in files)
+        for state, year, quarter, path in files:
+            if slices[(state, year, quarter)] > 1:
+                self.add(dataset, "duplicate_slice", "error", "several files for one slice",
+                         file=path, slice=slice_name(state, year, quarter))
+        # Quarters outside 1-4 are range errors of their batch, not part of the grid
+        slices = [(state, year, quarter) for state, year, quarter in slices if 1 <= quarter <= 4]
+        if not slices:
+            return
+
+        periods = [year * 4 + quarter - 1 for _, year, quarter in slices]
+        grid = np.arange(min(periods), max(periods) + 1)
+        present = {}
+        for state, year, quarter in slices:
+            present.setdefault(state, set()).add(year * 4 + quarter - 1)
+        for state, found in sorted(present.items()):
+            missing = grid[~np.isin(grid, list(found))]
+            if len(missing):
+                self.add(dataset, "missing_quarters", "warning",
+                         ", ".join(f"{period // 4} Q{period % 4 + 1}" for period in missing),
+                         slice=SLUG_BY_ID.get(state, state))
+
+    # Function to compare the slice totals of related tables (run after every
+    # dataset of the run was checked; only slices loaded for both are compared)
+    def check_cross_tables(self):
+        for left, column, right, reference, relation in CROSS_CHECKS:
+            if left not in self._totals or right not in self._totals:
+                continue
+            values = self._slice_totals(left, column)
+            references = self._slice_totals(right, reference)
+            values, references = values.align(references, join="inner")
+            difference = (values - references) / references.where(references != 0)
+            if relation == "equal":
+                bad = difference.abs() > TOLERANCE
+            else:
+                bad = values > references * (1 + TOLERANCE)
+            for (state, year, quarter), change in difference[bad].items():
+                self.add(left, "cross_table", "warning",
+                         f"{column} vs {right}.{reference}: {change:+.1%}",
+                         slice=slice_name(state, year, quarter))
+
+    # Function to get the report as a DataFrame (errors first)
+    def report(self):
+        report = pd.DataFrame(self.issues, columns=REPORT_COLUMNS).astype({"rows": "Int64"})
+        return report.sort_values(["severity", "dataset", "check"], kind="stable",
+                                  ignore_index=True)
+
+    # Function to count the issues by dataset, check and severity
+    def summary(self):
+        report = self.report()
+        return report.groupby(["dataset", "check", "severity"]).size().reset_index(name="issues")
+
+    # Function to write the report as JSON lines
+    def write_report(self, path):
+        self.report().to_json(path, orient="records", lines=True)
+
+
+# Function to make paths relative to the data folder (as in the ingest manifests)
+def relative_paths(root, paths):
+    return {os.path.relpath(path, root).replace(os.sep, "/") for path in paths}